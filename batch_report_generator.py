@@ -221,15 +221,6 @@ def generate_batch_reports():
                 if config['french_drain_enabled']:
                     french_drain_results = run_french_drain_analysis(hydrograph_data, config)
                 
-                # Generate comprehensive report
-                html_report = generate_comprehensive_engineering_report_lightweight(
-                    soakwell_results=soakwell_results,
-                    french_drain_results=french_drain_results,
-                    storm_name=storm_name,
-                    config=config,
-                    hydrograph_data=hydrograph_data
-                )
-                
                 # Create custom filename for batch reports
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                 config_safe = config['name'].replace(' ', '_').replace('(', '').replace(')', '').replace(',', '')
@@ -237,9 +228,16 @@ def generate_batch_reports():
                 filename = f"{config_safe}_{storm_safe}_{timestamp}.html"
                 filepath = os.path.join(reports_dir, filename)
                 
-                # Save report
+                # Generate comprehensive report straight into the file
                 with open(filepath, 'w', encoding='utf-8') as f:
-                    f.write(html_report)
+                    generate_comprehensive_engineering_report_lightweight(
+                        soakwell_results=soakwell_results,
+                        french_drain_results=french_drain_results,
+                        storm_name=storm_name,
+                        config=config,
+                        hydrograph_data=hydrograph_data,
+                        out=f
+                    )
                 
                 print(f"   ✅ Report saved: {filename}")
                 successful_reports += 1
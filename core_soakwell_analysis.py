@@ -4,8 +4,11 @@ Core Soakwell Analysis Functions
 Standalone analysis functions without UI dependencies
 """
 
+import os
 import pandas as pd
+import numpy as np
 import math
+from functools import lru_cache
 
 def get_standard_soakwell_specs(diameter, depth):
     """
@@ -123,6 +126,67 @@ def read_hydrograph_data_from_content(content):
     
     return data
 
+def read_hydrograph_arrays(file_path):
+    """
+    Read a .ts1 file straight into (time_min, total_flow) float arrays
+    
+    Parsed files are cached in memory for the rest of the process and in a
+    '<file>.cache.npz' sidecar for later runs, both keyed by the file's
+    modification time and size. The arrays are shared between callers, so
+    they are returned read-only.
+    """
+    stat = os.stat(file_path)
+    return _read_hydrograph_arrays_cached(os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
+
+@lru_cache(maxsize=None)
+def _read_hydrograph_arrays_cached(file_path, mtime_ns, size):
+    """read_hydrograph_arrays for one version of a file, via the sidecar cache"""
+    cache_path = file_path + '.cache.npz'
+    try:
+        with np.load(cache_path) as cached:
+            if cached['mtime_ns'] != mtime_ns or cached['size'] != size:
+                raise ValueError('stale hydrograph cache')
+            time_min, total_flow = cached['time_min'], cached['total_flow']
+    except Exception:
+        # Missing, stale or unreadable cache: parse the file and refresh it
+        time_min, total_flow = _parse_hydrograph_file(file_path)
+        _save_hydrograph_cache(cache_path, mtime_ns, size, time_min, total_flow)
+    
+    time_min.flags.writeable = False
+    total_flow.flags.writeable = False
+    return time_min, total_flow
+
+def _parse_hydrograph_file(file_path):
+    """
+    Parse a .ts1 file into (time_min, total_flow) float arrays
+    
+    The numeric block (from line 10) is converted by the pandas C reader in
+    one pass; files it cannot parse cleanly (comments, malformed rows) go
+    through read_hydrograph_data_from_content instead, so both give the same
+    data.
+    """
+    try:
+        values = pd.read_csv(file_path, skiprows=9, header=None, usecols=[0, 1],
+                             dtype=np.float64, engine='c').to_numpy()
+    except ValueError:
+        values = None
+    if values is None or np.isnan(values).any():
+        with open(file_path, 'r') as f:
+            data = read_hydrograph_data_from_content(f.read())
+        return (np.asarray(data['time_min'], dtype=np.float64),
+                np.asarray(data['total_flow'], dtype=np.float64))
+    return values[:, 0], values[:, 1]
+
+def _save_hydrograph_cache(cache_path, mtime_ns, size, time_min, total_flow):
+    """Write the parsed arrays next to the .ts1 file (skipped if the folder is read-only)"""
+    tmp_path = cache_path + '.tmp'
+    try:
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, mtime_ns=mtime_ns, size=size, time_min=time_min, total_flow=total_flow)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+
 def calculate_soakwell_outflow_rate(diameter, ks=1e-5, Sr=1.0):
     """Calculate steady-state outflow rate from soakwell"""
     height = diameter
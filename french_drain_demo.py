@@ -215,7 +215,7 @@ def design_french_drain_for_site(peak_flow_m3s, total_volume_m3, available_lengt
     
     # Check pipe capacity
     pipe_props = drain.calculate_pipe_capacity(slope=0.005)
-    pipe_capacity = pipe_props['flow_capacity_full']
+    pipe_capacity = pipe_props.flow_capacity_full
     
     print(f"- Pipe capacity (300mm, 0.5% grade): {pipe_capacity:.4f} m³/s")
     
@@ -283,34 +283,33 @@ def main_demonstration():
     print("FRENCH DRAIN MODELING DEMONSTRATION")
     print("="*50)
     
-    # Create example hydrograph data (similar to soakwell dashboard format)
-    example_hydrograph = {
-        'time_min': list(range(0, 240, 5)),  # 4 hours, 5-minute intervals
-        'total_flow': []
-    }
-    
-    # Create triangular storm hydrograph
+    # Create triangular storm hydrograph (4 hours, 5-minute intervals)
+    time_min = np.arange(0, 240, 5, dtype=float)
     peak_time = 60  # Peak at 1 hour
     peak_flow = 0.05  # Peak flow 0.05 m³/s
     
-    for t in example_hydrograph['time_min']:
-        if t <= peak_time:
-            flow = peak_flow * (t / peak_time)
-        else:
-            flow = peak_flow * (1 - (t - peak_time) / (180 - peak_time))  # Falling limb
-        example_hydrograph['total_flow'].append(max(0, flow))
+    flow = np.where(time_min <= peak_time,
+                    peak_flow * (time_min / peak_time),
+                    peak_flow * (1 - (time_min - peak_time) / (180 - peak_time)))  # Falling limb
+    np.maximum(flow, 0, out=flow)
+    
+    # Example hydrograph data (similar to soakwell dashboard format)
+    example_hydrograph = {
+        'time_min': time_min.tolist(),
+        'total_flow': flow.tolist()
+    }
     
     print(f"Created example storm hydrograph:")
     print(f"- Duration: 4 hours")
-    print(f"- Peak flow: {max(example_hydrograph['total_flow']):.4f} m³/s")
-    print(f"- Total volume: {sum(example_hydrograph['total_flow']) * 5 * 60:.1f} m³")
+    print(f"- Peak flow: {flow.max():.4f} m³/s")
+    print(f"- Total volume: {flow.sum() * 5 * 60:.1f} m³")
     
     # Run comparative analysis
     comparison_results = compare_drainage_systems(example_hydrograph)
     
     # Design recommendation
-    peak_flow = max(example_hydrograph['total_flow'])
-    total_volume = sum(example_hydrograph['total_flow']) * 5 * 60  # 5-minute intervals
+    peak_flow = flow.max()
+    total_volume = flow.sum() * 5 * 60  # 5-minute intervals
     
     design_results = design_french_drain_for_site(
         peak_flow_m3s=peak_flow,
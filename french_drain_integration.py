@@ -9,11 +9,10 @@ import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-import math
 
 # Import French drain model with error handling
 try:
-    from french_drain_model import FrenchDrainModel
+    from french_drain_model import FrenchDrainModel, cumulative_volume
     FRENCH_DRAIN_MODEL_AVAILABLE = True
 except ImportError as e:
     FRENCH_DRAIN_MODEL_AVAILABLE = False
@@ -125,8 +124,7 @@ def run_french_drain_analysis(hydrograph_data_dict, soil_params, french_drain_pa
     
     # Update model parameters
     drain.pipe_diameter = french_drain_params['pipe_diameter_m']
-    drain.pipe_radius = drain.pipe_diameter / 2
-    drain.pipe_area = math.pi * drain.pipe_radius**2
+    drain.update_pipe_constants()
     
     drain.trench_width = french_drain_params['trench_width_m']
     drain.trench_depth = french_drain_params['trench_depth_m']
@@ -389,9 +387,9 @@ def display_french_drain_results(french_drain_results, french_drain_params):
                         overflow_status = "No Overflow" if perf['total_overflow_m3'] == 0 else f"{perf['total_overflow_m3']:.1f} m³"
                         st.metric("Overflow", overflow_status)
                     
-                    # Performance plot
-                    fig = create_french_drain_performance_plot(result, scenario_name)
-                    st.plotly_chart(fig, use_container_width=True)
+                    # Performance plot (pre-serialized and cached across reruns)
+                    fig_dict = get_french_drain_performance_plot_dict(result, scenario_name)
+                    st.plotly_chart(fig_dict, use_container_width=True)
     
     else:
         st.warning("No French drain results available. Check for errors in the analysis.")
@@ -448,8 +446,9 @@ def create_french_drain_performance_plot(result, scenario_name):
     )
     
     # Plot 4: Cumulative volumes
-    cumulative_inflow = np.cumsum(result['inflow']) * np.gradient(result['time'])
-    cumulative_infiltration = np.cumsum(result['infiltration_outflow']) * np.gradient(result['time'])
+    dt_half = 0.5 * np.diff(result['time'])
+    cumulative_inflow = cumulative_volume(result['inflow'], result['time'], dt_half)
+    cumulative_infiltration = cumulative_volume(result['infiltration_outflow'], result['time'], dt_half)
     
     fig.add_trace(
         go.Scatter(x=time_hours, y=cumulative_inflow, 
@@ -479,6 +478,19 @@ def create_french_drain_performance_plot(result, scenario_name):
     
     return fig
 
+@st.cache_data(max_entries=50)  # Limit cache size for memory management
+def get_french_drain_performance_plot_dict(result, scenario_name):
+    """
+    Build the French drain performance plot once and cache its serialized form
+    
+    Streamlit reruns the script on every widget change; caching the figure as a
+    plain dict avoids rebuilding and re-serializing the time series each rerun.
+    
+    Returns:
+    dict: Plotly figure dictionary accepted by st.plotly_chart
+    """
+    return create_french_drain_performance_plot(result, scenario_name).to_dict()
+
 def generate_comparison_report(soakwell_results, french_drain_results, soil_params, config_params):
     """
     Generate comprehensive comparison report between soakwell and French drain systems
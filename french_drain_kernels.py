@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Ahead-of-Time Compiled French Drain Kernels
+Builds the French drain simulation loop into a native extension module
+
+Numba's JIT compiles the simulation loop on the first call of each process,
+which makes a single short simulation slower than pure Python. Compiling the
+loop ahead of time removes that warm-up entirely.
+
+Usage:
+    python french_drain_kernels.py
+
+This writes the fd_kernels extension module next to this file. french_drain_model
+picks it up automatically when it is importable and was built from the current
+_simulate_core (its kernel_version matches _KERNEL_VERSION in french_drain_model.py);
+rebuild after changing _simulate_core, or the model falls back to the JIT kernel.
+
+Author: Engineering Analysis
+Date: July 2025
+"""
+
+import os
+from numba.pycc import CC
+
+from french_drain_model import _simulate_core_py, _KERNEL_VERSION
+
+cc = CC('fd_kernels')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+# dts, pipe_flow, trench_volume, infiltration_outflow, system_overflow,
+# max_trench_volume, a_inf, b_inf, damping_factor, start, stop
+for name, ftype in (('simulate_core', 'f8'), ('simulate_core_f4', 'f4')):
+    cc.export(
+        name,
+        f'void({ftype}[:], {ftype}[:], {ftype}[:], {ftype}[:], {ftype}[:], f8, f8, f8, f8, i8, i8)'
+    )(_simulate_core_py)
+
+@cc.export('kernel_version', 'i8()')
+def kernel_version():
+    """_KERNEL_VERSION of the step loop this module was built from"""
+    return _KERNEL_VERSION
+
+if __name__ == "__main__":
+    cc.compile()
+    print(f"✅ Compiled fd_kernels into {cc.output_dir}")
@@ -17,13 +17,309 @@ Date: July 2025
 import numpy as np
 import pandas as pd
 import math
+import importlib.util
+from functools import lru_cache
+from typing import NamedTuple
 
-# Optional matplotlib import
+# Optional matplotlib, imported only when plotting (simulations never need it)
+MATPLOTLIB_AVAILABLE = importlib.util.find_spec('matplotlib') is not None
+
+# math.cbrt is only available from Python 3.11
 try:
-    import matplotlib.pyplot as plt
-    MATPLOTLIB_AVAILABLE = True
+    from math import cbrt as _cbrt
 except ImportError:
-    MATPLOTLIB_AVAILABLE = False
+    def _cbrt(x):
+        """Cube root fallback for Python < 3.11"""
+        return x ** (1/3)
+
+# Optional numba import for compiling the simulation loop
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+def _simulate_core(dts, pipe_flow, trench_volume, infiltration_outflow, system_overflow,
+                   max_trench_volume, a_inf, b_inf, damping_factor, start, stop):
+    """
+    Time-stepping loop of the French drain simulation over steps [start, stop)
+    
+    Fills the pre-allocated output arrays in place, with dts[i] the step
+    from time[i-1] to time[i]. pipe_flow and system_overflow arrive holding
+    the capacity-limited pipe flow and the inflow above pipe capacity; the
+    loop adds trench overflow on top. The smoothed infiltration rate is
+    a_inf + b_inf * V for stored volume V (capped at the trench volume).
+    Only scalars and NumPy arrays are used so the loop can be compiled with
+    numba when available.
+    """
+    for i in range(start, stop):
+        current_pipe_flow = pipe_flow[i]
+        prev_vol = trench_volume[i-1]
+        
+        # Nothing arriving and nothing stored: the step stays empty
+        if current_pipe_flow == 0.0 and prev_vol == 0.0:
+            trench_volume[i] = 0.0
+            infiltration_outflow[i] = 0.0
+            continue
+        
+        dt_actual = dts[i]
+        
+        # 1-2. All pipe flow (capacity-limited up front) enters trench storage
+        inflow_to_trench = current_pipe_flow * dt_actual  # m³
+        
+        # 3. Stable infiltration rate (smoothed based on average storage level)
+        if prev_vol > 0:
+            # Smooth infiltration rate that prevents oscillations
+            storage = prev_vol if prev_vol < max_trench_volume else max_trench_volume
+            # More gradual infiltration response
+            infiltration_outflow[i] = a_inf + b_inf * storage
+        else:
+            infiltration_outflow[i] = 0.0
+        
+        # A repeated time stamp is a zero-length step: nothing enters or leaves
+        # the trench (checked here so the compiled kernels never divide by zero)
+        if dt_actual <= 0.0:
+            trench_volume[i] = prev_vol
+            continue
+        
+        # 4. Smart outflow calculation to prevent over-infiltration
+        max_possible_outflow = prev_vol / dt_actual  # Can't drain more than available
+        requested_infiltration_rate = (infiltration_outflow[i] if infiltration_outflow[i] < max_possible_outflow
+                                       else max_possible_outflow)
+        outflow_from_trench = requested_infiltration_rate * dt_actual  # m³
+        
+        # Update actual infiltration rate for reporting
+        infiltration_outflow[i] = requested_infiltration_rate
+        
+        # 5. Update trench volume with stability damping
+        net_volume_change = inflow_to_trench - outflow_from_trench
+        # Apply damping factor to prevent large oscillations
+        damped_volume_change = net_volume_change * damping_factor
+        new_trench_volume = prev_vol + damped_volume_change
+        
+        # 6. Apply physical constraints smoothly
+        if new_trench_volume > max_trench_volume:
+            # Trench is full - excess becomes overflow
+            excess_volume = new_trench_volume - max_trench_volume
+            trench_volume[i] = max_trench_volume
+            system_overflow[i] += excess_volume / dt_actual
+        elif new_trench_volume < 0:
+            # Cannot have negative storage
+            trench_volume[i] = 0.0
+            drained_rate = prev_vol / dt_actual
+            infiltration_outflow[i] = drained_rate if drained_rate > 0.0 else 0.0
+        else:
+            trench_volume[i] = new_trench_volume
+
+def cumulative_volume(flow, time, dt_half=None):
+    """
+    Running trapezoidal volume (m³) of a flow series (m³/s), zero at the first sample
+    
+    The trapezoid increments are built and summed in place in the output
+    array. Pass dt_half (half of each time step) to share it across series.
+    """
+    flow = np.asarray(flow, dtype=np.float64)
+    out = np.empty_like(flow)
+    if out.size == 0:
+        return out
+    if dt_half is None:
+        dt_half = 0.5 * np.diff(time)
+    out[0] = 0.0
+    increments = out[1:]
+    np.add(flow[1:], flow[:-1], out=increments)
+    increments *= dt_half
+    np.cumsum(increments, out=increments)
+    return out
+
+def _trapezoid_volume(flow, dt_half):
+    """Trapezoidal volume (m³) of a flow series given half of each time step"""
+    return float(np.dot(flow[1:], dt_half) + np.dot(flow[:-1], dt_half))
+
+def _affine_scan(v0, r, c):
+    """Solve v[k] = r[k] * v[k-1] + c[k] for every k in one pass, with v[-1] = v0"""
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore', under='ignore'):
+        p = np.cumprod(r)
+        return p * (v0 + np.cumsum(c / p))
+
+def _simulate_rate_limited(dts, pipe_flow, trench_volume, infiltration_outflow, start, stop,
+                           a_inf, b_inf, damping_factor, max_trench_volume):
+    """
+    Vectorized steps [start, stop) while infiltration follows the smoothed rate
+    
+    While the trench holds water, the smoothed infiltration rate a + b*V is
+    below the drainable rate V/dt and the volume stays within storage, the step
+    loop is affine in the stored volume V: V' = (1 - d*b*dt)*V + d*(q - a)*dt.
+    That stretch is solved with one scan, matching the step loop to rounding.
+    
+    Returns:
+    int: First step that leaves this regime (stop when the whole range stayed in it)
+    """
+    dt = dts[start:stop]
+    v_prev = trench_volume[start-1]
+    n = dt.shape[0]
+    
+    volume = _affine_scan(v_prev, 1.0 - damping_factor * b_inf * dt,
+                          damping_factor * dt * (pipe_flow[start:stop] - a_inf))
+    prev = np.concatenate(([v_prev], volume[:-1]))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        in_regime = ((prev > 0) & (a_inf + b_inf * prev < prev / dt) &
+                     (volume >= 0) & (volume <= max_trench_volume))
+    n_rate = n if in_regime.all() else int(np.argmin(in_regime))
+    trench_volume[start:start+n_rate] = volume[:n_rate]
+    infiltration_outflow[start:start+n_rate] = a_inf + b_inf * prev[:n_rate]
+    
+    return start + n_rate
+
+# Shortest zero-inflow run worth solving in closed form rather than stepping
+_MIN_RECESSION_STEPS = 16
+
+def _simulate_recession(dts, pipe_flow, trench_volume, infiltration_outflow, start, stop,
+                        a_inf, b_inf, damping_factor, max_trench_volume):
+    """
+    Vectorized drain-down of the trench over zero-inflow steps [start, stop)
+    
+    With no inflow the step loop is piecewise linear in the stored volume V.
+    While the smoothed infiltration rate a + b*V is below the drainable rate
+    V/dt the volume follows V' = (1 - d*b*dt)*V - d*a*dt; once it is not, the
+    trench drains at V/dt and V' = (1 - d)*V. Both stages are solved in closed
+    form, matching the step loop to rounding.
+    
+    Returns:
+    int: First step left for the step loop (stop when the whole range was handled)
+    """
+    dt = dts[start:stop]
+    n = dt.shape[0]
+    
+    # Stage 1: infiltration limited by the smoothed rate
+    n_rate = _simulate_rate_limited(dts, pipe_flow, trench_volume, infiltration_outflow, start, stop,
+                                    a_inf, b_inf, damping_factor, max_trench_volume) - start
+    
+    if n_rate == n:
+        return stop
+    
+    # Stage 2: trench drains everything available each step (damped)
+    v_prev = trench_volume[start+n_rate-1]
+    volume = v_prev * np.cumprod(np.full(n - n_rate, 1.0 - damping_factor))
+    prev = np.concatenate(([v_prev], volume[:-1]))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        drain_limited = ~((prev > 0) & (a_inf + b_inf * prev < prev / dt[n_rate:]))
+    n_drain = n - n_rate if drain_limited.all() else int(np.argmin(drain_limited))
+    i = start + n_rate
+    trench_volume[i:i+n_drain] = volume[:n_drain]
+    infiltration_outflow[i:i+n_drain] = prev[:n_drain] / dt[n_rate:n_rate+n_drain]
+    
+    return i + n_drain
+
+# Pure-Python kernel, also the source for the ahead-of-time build in french_drain_kernels.py
+_simulate_core_py = _simulate_core
+
+# Bump whenever _simulate_core changes behaviour so stale ahead-of-time builds are ignored
+_KERNEL_VERSION = 2
+
+if NUMBA_AVAILABLE:
+    _simulate_core = njit(cache=True, fastmath=True)(_simulate_core)
+
+# Per-storm kernel used by the batch loop (numba can only call jitted functions)
+_batch_row_kernel = _simulate_core
+
+def _simulate_batch(dts, state, stops, max_trench_volume, a_inf, b_inf, damping_factor):
+    """
+    Run the step loop for a stack of padded storms, one storm per thread
+    
+    dts is (storms, steps) and state is (storms, 5, steps) in the row order
+    used by simulate_french_drain_response; storm s is simulated over
+    steps [1, stops[s]). Storms are independent, so the outer loop runs in
+    parallel when numba is available.
+    """
+    for s in prange(state.shape[0]):
+        _batch_row_kernel(dts[s], state[s, 0], state[s, 1], state[s, 3], state[s, 4],
+                          max_trench_volume, a_inf, b_inf, damping_factor, 1, stops[s])
+
+if NUMBA_AVAILABLE:
+    _simulate_batch = njit(cache=True, parallel=True)(_simulate_batch)
+
+# Prefer the ahead-of-time compiled kernel when it has been built, which
+# avoids the JIT warm-up on the first simulation of each process
+# (built for float64 and float32 state). A build of an older step loop is
+# skipped so the compiled and interpreted paths cannot diverge.
+try:
+    from fd_kernels import simulate_core as _simulate_core_f8, simulate_core_f4 as _simulate_core_f4
+    from fd_kernels import kernel_version as _aot_kernel_version
+    
+    if _aot_kernel_version() != _KERNEL_VERSION:
+        raise ImportError("fd_kernels is out of date; rebuild it with french_drain_kernels.py")
+    
+    def _simulate_core(dts, *args):
+        """Dispatch to the ahead-of-time kernel built for the state dtype"""
+        if dts.dtype == np.float32:
+            return _simulate_core_f4(dts, *args)
+        return _simulate_core_f8(dts, *args)
+    
+    FD_KERNELS_AOT = True
+except ImportError:
+    FD_KERNELS_AOT = False
+
+# Windowed vector integration only pays off when the step loop is interpreted
+_KERNEL_COMPILED = _simulate_core is not _simulate_core_py
+_VECTOR_WINDOW = 512
+_MIN_STEP_BLOCK = 16
+
+def _simulate_active(dts, pipe_flow, trench_volume, infiltration_outflow, system_overflow,
+                     max_trench_volume, a_inf, b_inf, damping_factor, start, stop):
+    """
+    Simulate steps [start, stop) of a storm with inflow
+    
+    A compiled step loop runs the whole range. Interpreted, stretches that
+    stay in the smoothed-rate regime are solved by windowed vector scans and
+    the step loop only handles the steps around storage limits, in blocks
+    that grow (up to one window) while the scans make little progress.
+    """
+    if _KERNEL_COMPILED:
+        _simulate_core(dts, pipe_flow, trench_volume, infiltration_outflow, system_overflow,
+                       max_trench_volume, a_inf, b_inf, damping_factor, start, stop)
+        return
+    
+    block = _MIN_STEP_BLOCK
+    step = start
+    while step < stop:
+        window_end = min(step + _VECTOR_WINDOW, stop)
+        scanned = _simulate_rate_limited(dts, pipe_flow, trench_volume, infiltration_outflow,
+                                         step, window_end, a_inf, b_inf, damping_factor,
+                                         max_trench_volume)
+        if scanned == window_end:
+            step = scanned
+            block = _MIN_STEP_BLOCK
+            continue
+        
+        # Grow the step block while scans cover fewer steps than it did
+        block = min(block * 2, _VECTOR_WINDOW) if scanned - step < block else _MIN_STEP_BLOCK
+        resume = min(scanned + block, stop)
+        _simulate_core(dts, pipe_flow, trench_volume, infiltration_outflow, system_overflow,
+                       max_trench_volume, a_inf, b_inf, damping_factor, scanned, resume)
+        step = resume
+
+class PipeProps(NamedTuple):
+    """Full-pipe flow characteristics from calculate_pipe_capacity"""
+    flow_capacity_full: float  # m³/s
+    velocity_full: float       # m/s
+    hydraulic_radius: float    # m
+    slope: float               # m/m
+    area: float                # m²
+
+@lru_cache(maxsize=32)
+def _pipe_capacity(diameter, roughness, slope):
+    """
+    Full-pipe Manning capacity of a circular pipe, memoized on its inputs
+    
+    Returns:
+    PipeProps: Immutable, so the cached instance is shared between callers
+    """
+    radius = diameter / 2
+    area = math.pi * radius**2
+    hydraulic_radius = area / (math.pi * diameter)
+    q_full = (1/roughness) * area * _cbrt(hydraulic_radius * hydraulic_radius) * math.sqrt(slope)
+    return PipeProps(q_full, q_full / area, hydraulic_radius, slope, area)
 
 class FrenchDrainModel:
     """
@@ -35,8 +331,6 @@ class FrenchDrainModel:
         
         # Pipe specifications
         self.pipe_diameter = 0.30  # m (300mm)
-        self.pipe_radius = self.pipe_diameter / 2
-        self.pipe_area = math.pi * self.pipe_radius**2  # m²
         
         # Trench geometry
         self.trench_width = 0.60   # m (600mm)
@@ -57,7 +351,23 @@ class FrenchDrainModel:
         self.pipe_roughness = 0.012  # Manning's n for concrete pipe
         
         # Calculated properties
+        self.update_pipe_constants()
         self.effective_storage_volume = self.trench_area * self.aggregate_porosity  # m³/m length
+    
+    def update_pipe_constants(self):
+        """
+        Recalculate pipe geometry and Manning's constant
+        Call again after changing pipe_diameter or pipe_roughness
+        """
+        
+        self.pipe_radius = self.pipe_diameter / 2
+        self.pipe_area = math.pi * self.pipe_radius**2  # m²
+        self.wetted_perimeter_full = math.pi * self.pipe_diameter  # m (full pipe)
+        self.hydraulic_radius_full = self.pipe_area / self.wetted_perimeter_full  # m
+        
+        # Slope-independent part of Manning's equation: (1/n) * A * R^(2/3)
+        R = self.hydraulic_radius_full
+        self.manning_const = (1/self.pipe_roughness) * self.pipe_area * _cbrt(R * R)
         
     def calculate_pipe_capacity(self, slope=0.005):
         """
@@ -67,65 +377,52 @@ class FrenchDrainModel:
         slope: Pipe gradient (m/m), default 0.5%
         
         Returns:
-        dict: Pipe flow characteristics
+        PipeProps: Pipe flow characteristics
         """
         
         # Manning's equation for circular pipe
-        # Q = (1/n) * A * R^(2/3) * S^(1/2)
-        
-        n = self.pipe_roughness
-        A = self.pipe_area
-        P = math.pi * self.pipe_diameter  # Wetted perimeter (full pipe)
-        R = A / P  # Hydraulic radius
-        S = slope
+        # Q = (1/n) * A * R^(2/3) * S^(1/2), memoized since batch runs
+        # reuse the same pipe and slope for every storm
+        return _pipe_capacity(self.pipe_diameter, self.pipe_roughness, slope)
+    
+    def calculate_pipe_capacity_vec(self, slopes):
+        """
+        Vectorized full-pipe capacity for a sweep of pipe slopes
         
-        # Full pipe capacity
-        Q_full = (1/n) * A * (R**(2/3)) * (S**0.5)  # m³/s
+        Parameters:
+        slopes: Array of pipe gradients (m/m)
         
-        # Velocity at full capacity
-        V_full = Q_full / A  # m/s
+        Returns:
+        ndarray: Full pipe flow capacity for each slope (m³/s)
+        """
         
-        return {
-            'flow_capacity_full': Q_full,
-            'velocity_full': V_full,
-            'hydraulic_radius': R,
-            'slope': slope,
-            'area': A
-        }
+        return self.manning_const * np.sqrt(np.asarray(slopes, dtype=np.float64))
     
     def calculate_infiltration_rate(self, water_level_in_trench):
         """
         Calculate infiltration rate from trench to native soil
-        Uses Darcy's law with cylindrical flow geometry
+        Uses Darcy's law over the wetted trench bottom and sides
         
         Parameters:
-        water_level_in_trench: Height of water in trench (m)
+        water_level_in_trench: Height of water in trench (m), scalar or array
         
         Returns:
-        float: Infiltration rate (m³/s per meter length)
+        float or ndarray: Infiltration rate (m³/s per meter length)
         """
         
-        if water_level_in_trench <= 0:
-            return 0.0
-        
-        # Effective infiltration area (bottom and sides of trench)
-        # Bottom area per unit length
-        bottom_area = self.trench_width * 1.0  # m² per meter length
-        
-        # Side area per unit length (only up to water level)
-        side_area = 2 * water_level_in_trench * 1.0  # m² per meter length
+        water_level = np.asarray(water_level_in_trench, dtype=np.float64)
         
-        total_infiltration_area = bottom_area + side_area
+        # Effective infiltration area per meter length (m²):
+        # trench bottom plus both sides up to the water level
+        total_infiltration_area = self.trench_width + 2 * water_level
         
         # Hydraulic gradient (assuming unit gradient for deep water table)
-        # For cylindrical flow around a trench, use equivalent radius approach
-        equivalent_radius = (self.trench_width * water_level_in_trench / math.pi)**0.5
-        
         # Darcy's law: q = k * i * A
         # For steady state infiltration, assume gradient ≈ 1 (conservative)
-        infiltration_rate = self.soil_k * total_infiltration_area  # m³/s per meter
+        # No infiltration from an empty trench
+        infiltration_rate = np.where(water_level > 0, self.soil_k * total_infiltration_area, 0.0)  # m³/s per meter
         
-        return infiltration_rate
+        return infiltration_rate if infiltration_rate.ndim else float(infiltration_rate)
     
     def calculate_perforation_inflow(self, pipe_flow_rate, pipe_water_level, trench_water_level):
         """
@@ -133,19 +430,46 @@ class FrenchDrainModel:
         This eliminates numerical instability from complex orifice calculations
         
         Parameters:
-        pipe_flow_rate: Current flow in pipe (m³/s)
+        pipe_flow_rate: Current flow in pipe (m³/s), scalar or array
         pipe_water_level: Water level in pipe (m from pipe bottom) - not used in simplified model
         trench_water_level: Water level in trench (m from trench bottom) - not used in simplified model
         
         Returns:
-        float: Perforation inflow rate equals pipe flow rate (m³/s per meter length)
+        float or ndarray: Perforation inflow rate equals pipe flow rate (m³/s per meter length)
         """
         
         # Simplified: all pipe flow enters the trench through perforations
         # This represents a well-perforated French drain pipe
         return pipe_flow_rate
     
-    def simulate_french_drain_response(self, inflow_hydrograph, pipe_slope=0.005, length=100.0, dt=60.0):
+    def _simulation_constants(self, pipe_slope, length):
+        """
+        Loop-invariant constants of the simulation for a given slope and length
+        
+        Returns:
+        tuple: (max pipe flow m³/s, max trench volume m³, infiltration rate at an
+                empty trench m³/s, its increase per stored m³ 1/s,
+                water level per stored m³ 1/m², damping factor)
+        """
+        
+        max_pipe_flow = self.calculate_pipe_capacity(pipe_slope).flow_capacity_full
+        max_trench_volume = self.trench_width * length * self.trench_depth * self.aggregate_porosity
+        trench_base_area = self.trench_width * length
+        
+        # Stable infiltration calculation - more conservative rate
+        max_infiltration_rate = self.soil_k * trench_base_area * 0.5  # Reduce by factor of 2 for stability
+        
+        # Smoothed rate max_infiltration_rate * (0.2 + 0.6 * V / max_trench_volume) as a + b * V
+        a_inf = 0.2 * max_infiltration_rate
+        b_inf = 0.6 * max_infiltration_rate / max_trench_volume
+        
+        inv_storage_area = 1.0 / (trench_base_area * self.aggregate_porosity)  # Water level per stored m³ (1/m²)
+        damping_factor = 0.9  # Slightly damp changes
+        
+        return max_pipe_flow, max_trench_volume, a_inf, b_inf, inv_storage_area, damping_factor
+    
+    def simulate_french_drain_response(self, inflow_hydrograph, pipe_slope=0.005, length=100.0, dt=60.0,
+                                       dtype=np.float64):
         """
         Simulate French drain system with stable numerical methods
         
@@ -154,93 +478,100 @@ class FrenchDrainModel:
         pipe_slope: Longitudinal slope of pipe (m/m)  
         length: Length of French drain (m)
         dt: Time step (seconds) - not used, actual time steps from data are used
+        dtype: Float type of the simulated series; np.float32 halves memory for large sweeps
         
         Returns:
         dict: Simulation results with physically realistic behavior
         """
         
-        time = np.array(inflow_hydrograph['time'])
-        inflow = np.array(inflow_hydrograph['flow'])
+        time = np.ascontiguousarray(inflow_hydrograph['time'], dtype=np.float64)
+        inflow = np.ascontiguousarray(inflow_hydrograph['flow'], dtype=np.float64)
         
         # Initialize arrays
         n_steps = len(time)
         
-        # State variables
-        pipe_flow = np.zeros(n_steps)  # Flow in pipe (m³/s)
-        trench_volume = np.zeros(n_steps)  # Stored volume in trench (m³)
-        trench_water_level = np.zeros(n_steps)  # Water level in trench (m)
+        # State and output series share one contiguous block, one row per series
+        # (the simulation loop fills every step after the first)
+        state = np.empty((5, n_steps), dtype=dtype)
+        (pipe_flow,             # Flow in pipe (m³/s)
+         trench_volume,         # Stored volume in trench (m³)
+         trench_water_level,    # Water level in trench (m)
+         infiltration_outflow,  # Flow from trench to soil (m³/s)
+         system_overflow        # Total system overflow (m³/s)
+         ) = state
         
-        # Output variables (simplified to key flows)
-        infiltration_outflow = np.zeros(n_steps)  # Flow from trench to soil (m³/s)
-        system_overflow = np.zeros(n_steps)  # Total system overflow (m³/s)
+        # Initial conditions: empty trench, no flow
+        state[:, 0] = 0.0
         
         # Physical constraints
-        pipe_props = self.calculate_pipe_capacity(pipe_slope)
-        max_pipe_flow = pipe_props['flow_capacity_full']
-        max_trench_volume = self.trench_width * length * self.trench_depth * self.aggregate_porosity
-        trench_base_area = self.trench_width * length
-        
-        # Stable infiltration calculation - more conservative rate
-        max_infiltration_rate = self.soil_k * trench_base_area * 0.5  # Reduce by factor of 2 for stability
-        
-        # Simulation loop with stable numerical integration
-        for i in range(1, n_steps):
-            dt_actual = time[i] - time[i-1]
-            current_inflow = inflow[i]
-            
-            # 1. Determine pipe flow (limited by pipe capacity)
-            pipe_flow[i] = min(current_inflow, max_pipe_flow)
-            immediate_overflow = max(0.0, current_inflow - max_pipe_flow)
-            
-            # 2. All pipe flow enters trench storage
-            inflow_to_trench = pipe_flow[i] * dt_actual  # m³
-            
-            # 3. Stable infiltration rate (smoothed based on average storage level)
-            if trench_volume[i-1] > 0:
-                # Smooth infiltration rate that prevents oscillations
-                storage_fraction = min(trench_volume[i-1] / max_trench_volume, 1.0)
-                # More gradual infiltration response
-                infiltration_outflow[i] = max_infiltration_rate * (0.2 + 0.6 * storage_fraction)
-            else:
-                infiltration_outflow[i] = 0.0
+        (max_pipe_flow, max_trench_volume, a_inf, b_inf,
+         inv_storage_area, damping_factor) = self._simulation_constants(pipe_slope, length)
+        
+        # Time step into each sample
+        dts = np.empty(n_steps, dtype=dtype)
+        dts[0] = 0.0
+        dts[1:] = np.diff(time)
+        
+        # Pipe capacity limit and the inflow it cannot take depend only on the
+        # inflow series, so both are set for every step ahead of the loop
+        np.minimum(inflow[1:], max_pipe_flow, out=pipe_flow[1:])
+        np.subtract(inflow[1:], max_pipe_flow, out=system_overflow[1:])
+        np.maximum(system_overflow[1:], 0.0, out=system_overflow[1:])
+        
+        # Long runs of zero inflow only drain the trench and are solved in
+        # closed form (smoothed rate = a + b * volume); the step loop covers the rest
+        zero_inflow = np.zeros(n_steps + 1, dtype=np.int8)
+        zero_inflow[1:n_steps] = inflow[1:] == 0.0
+        edges = np.diff(zero_inflow)
+        run_starts = np.flatnonzero(edges == 1) + 1
+        run_ends = np.flatnonzero(edges == -1) + 1
+        long_runs = run_ends - run_starts >= _MIN_RECESSION_STEPS
+        
+        step = 1
+        for run_start, run_end in zip(run_starts[long_runs], run_ends[long_runs]):
+            # Simulation loop with stable numerical integration
+            _simulate_active(dts, pipe_flow, trench_volume, infiltration_outflow, system_overflow,
+                             max_trench_volume, a_inf, b_inf, damping_factor,
+                             step, run_start)
             
-            # 4. Smart outflow calculation to prevent over-infiltration
-            max_possible_outflow = trench_volume[i-1] / dt_actual  # Can't drain more than available
-            requested_infiltration_rate = min(infiltration_outflow[i], max_possible_outflow)
-            outflow_from_trench = requested_infiltration_rate * dt_actual  # m³
+            resume = _simulate_recession(dts, pipe_flow, trench_volume, infiltration_outflow,
+                                         run_start, run_end, a_inf, b_inf, damping_factor,
+                                         max_trench_volume)
             
-            # Update actual infiltration rate for reporting
-            infiltration_outflow[i] = requested_infiltration_rate
-            
-            # 5. Update trench volume with stability damping
-            net_volume_change = inflow_to_trench - outflow_from_trench
-            # Apply damping factor to prevent large oscillations
-            damping_factor = 0.9  # Slightly damp changes
-            damped_volume_change = net_volume_change * damping_factor
-            new_trench_volume = trench_volume[i-1] + damped_volume_change
-            
-            # 6. Apply physical constraints smoothly
-            if new_trench_volume > max_trench_volume:
-                # Trench is full - excess becomes overflow
-                excess_volume = new_trench_volume - max_trench_volume
-                trench_volume[i] = max_trench_volume
-                system_overflow[i] = immediate_overflow + excess_volume / dt_actual
-            elif new_trench_volume < 0:
-                # Cannot have negative storage
-                trench_volume[i] = 0.0
-                infiltration_outflow[i] = max(0.0, trench_volume[i-1] / dt_actual)
-                system_overflow[i] = immediate_overflow
-            else:
-                trench_volume[i] = new_trench_volume
-                system_overflow[i] = immediate_overflow
-            
-            # 7. Update water level smoothly
-            trench_water_level[i] = trench_volume[i] / (trench_base_area * self.aggregate_porosity)
+            # Irregular time steps can leave part of the run to the step loop
+            step = resume
+        
+        _simulate_active(dts, pipe_flow, trench_volume, infiltration_outflow, system_overflow,
+                         max_trench_volume, a_inf, b_inf, damping_factor,
+                         step, n_steps)
+        
+        # Water level is proportional to stored volume
+        np.multiply(trench_volume, inv_storage_area, out=trench_water_level)
+        
+        return self._package_results(time, inflow, dts, state, max_pipe_flow, pipe_slope, length)
+    
+    def _package_results(self, time, inflow, dts, state, max_pipe_flow, pipe_slope, length):
+        """
+        Build the results dictionary from the simulated state rows
+        
+        Parameters:
+        time, inflow, dts: Input series and time step into each sample
+        state: (5, n) block of pipe flow, trench volume, water level, infiltration and overflow
+        max_pipe_flow: Full pipe capacity used in the simulation (m³/s)
+        
+        Returns:
+        dict: Simulation results and performance metrics
+        """
+        
+        pipe_flow, trench_volume, trench_water_level, infiltration_outflow, system_overflow = state
         
         # Calculate performance metrics
-        total_inflow_volume = np.trapz(inflow, time)
-        total_infiltrated = np.trapz(infiltration_outflow, time)
-        total_overflow = np.trapz(system_overflow, time)
+        # Trapezoidal volumes share one half-step array; two dot products
+        # per series avoid building the averaged-flow temporary
+        dt_half = np.multiply(dts[1:], 0.5, dtype=np.float64)
+        total_inflow_volume = _trapezoid_volume(inflow, dt_half)
+        total_infiltrated = _trapezoid_volume(infiltration_outflow, dt_half)
+        total_overflow = _trapezoid_volume(system_overflow, dt_half)
         final_stored_volume = trench_volume[-1]
         
         # Mass balance check: In = Out + Stored + Error
@@ -267,8 +598,8 @@ class FrenchDrainModel:
                 'mass_balance_error_m3': mass_balance_error,
                 'mass_balance_error_percent': mass_balance_error_percent,
                 'infiltration_efficiency_percent': infiltration_efficiency,
-                'max_trench_storage_m3': max(trench_volume),
-                'max_water_level_m': max(trench_water_level),
+                'max_trench_storage_m3': trench_volume.max(),
+                'max_water_level_m': trench_water_level.max(),
                 'pipe_capacity_m3s': max_pipe_flow,
                 'system_length_m': length
             },
@@ -310,10 +641,17 @@ class FrenchDrainModel:
         )
         
         # Add analysis metadata
-        results['analysis_info'] = {
+        results['analysis_info'] = self._analysis_info(hydrograph_data, pipe_slope, length)
+        
+        return results
+    
+    def _analysis_info(self, hydrograph_data, pipe_slope, length):
+        """Metadata describing an external hydrograph and the system it was run through"""
+        
+        return {
             'data_source': 'External .ts1 file',
-            'total_duration_hours': (max(hydrograph_data['time']) - min(hydrograph_data['time'])) / 3600,
-            'peak_inflow_m3s': max(hydrograph_data['flow']),
+            'total_duration_hours': np.ptp(hydrograph_data['time']) / 3600,
+            'peak_inflow_m3s': np.max(hydrograph_data['flow']),
             'system_configuration': {
                 'pipe_diameter_mm': self.pipe_diameter * 1000,
                 'trench_dimensions': f"{self.trench_width*1000:.0f}mm × {self.trench_depth*1000:.0f}mm",
@@ -322,21 +660,83 @@ class FrenchDrainModel:
                 'pipe_slope_percent': pipe_slope * 100
             }
         }
+    
+    def batch_analyze(self, hydrographs, pipe_slope=0.005, length=100.0, dtype=np.float64):
+        """
+        Analyze many hydrographs with the same French drain system
         
-        return results
+        The storms are padded to a common length and simulated together, in
+        parallel across storms when numba is available.
+        
+        Parameters:
+        hydrographs: List of dicts with 'time' (seconds) and 'flow' (m³/s) arrays
+        pipe_slope: Longitudinal slope of pipe (m/m)
+        length: Length of French drain (m)
+        dtype: Float type of the simulated series; np.float32 halves memory for large sweeps
+        
+        Returns:
+        list: Results dictionary for each hydrograph, as from analyze_ts1_hydrograph
+        """
+        
+        for hydrograph_data in hydrographs:
+            if not isinstance(hydrograph_data, dict):
+                raise ValueError("Hydrograph data must be a dictionary")
+            if 'time' not in hydrograph_data or 'flow' not in hydrograph_data:
+                raise ValueError("Hydrograph data must contain 'time' and 'flow' keys")
+        
+        (max_pipe_flow, max_trench_volume, a_inf, b_inf,
+         inv_storage_area, damping_factor) = self._simulation_constants(pipe_slope, length)
+        
+        times = [np.ascontiguousarray(h['time'], dtype=np.float64) for h in hydrographs]
+        inflows = [np.ascontiguousarray(h['flow'], dtype=np.float64) for h in hydrographs]
+        stops = np.array([len(t) for t in times], dtype=np.int64)
+        n_storms = len(hydrographs)
+        n_max = int(stops.max()) if n_storms else 0
+        
+        # Zero padding past each storm's end is never read by its step loop
+        inflow_2d = np.zeros((n_storms, n_max))
+        dts = np.zeros((n_storms, n_max), dtype=dtype)
+        for s, (time, inflow) in enumerate(zip(times, inflows)):
+            inflow_2d[s, :len(inflow)] = inflow
+            dts[s, 1:len(time)] = np.diff(time)
+        
+        state = np.zeros((n_storms, 5, n_max), dtype=dtype)
+        np.minimum(inflow_2d[:, 1:], max_pipe_flow, out=state[:, 0, 1:])
+        np.subtract(inflow_2d[:, 1:], max_pipe_flow, out=state[:, 4, 1:])
+        np.maximum(state[:, 4, 1:], 0.0, out=state[:, 4, 1:])
+        
+        if n_storms:
+            _simulate_batch(dts, state, stops, max_trench_volume, a_inf, b_inf, damping_factor)
+        np.multiply(state[:, 1], inv_storage_area, out=state[:, 2])
+        
+        batch_results = []
+        for s, hydrograph_data in enumerate(hydrographs):
+            n = stops[s]
+            results = self._package_results(times[s], inflows[s], dts[s, :n], state[s, :, :n],
+                                            max_pipe_flow, pipe_slope, length)
+            results['analysis_info'] = self._analysis_info(hydrograph_data, pipe_slope, length)
+            batch_results.append(results)
+        
+        return batch_results
     
-    def plot_results(self, results, save_path=None):
+    def plot_results(self, results, save_path=None, show=True):
         """
         Create comprehensive plots of French drain performance
         
         Parameters:
         results: Results dictionary from simulate_french_drain_response
         save_path: Optional path to save plots
+        show: Display the figure; pass False to only save it (headless, Agg backend)
         """
         if not MATPLOTLIB_AVAILABLE:
             print("Matplotlib not available - cannot generate plots")
             return None
-            
+        
+        import matplotlib
+        if save_path and not show:
+            matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+        
         fig, axes = plt.subplots(2, 2, figsize=(15, 10))
         fig.suptitle('French Drain System Performance Analysis', fontsize=16, fontweight='bold')
         
@@ -348,7 +748,7 @@ class FrenchDrainModel:
         ax1.plot(time_hours, results['pipe_flow'], 'g-', label='Pipe Flow', linewidth=2)
         ax1.plot(time_hours, results['perforation_outflow'], 'orange', label='Perforation Outflow', linewidth=1.5)
         ax1.plot(time_hours, results['infiltration_outflow'], 'purple', label='Infiltration Rate', linewidth=1.5)
-        if max(results['pipe_overflow']) > 0:
+        if results['pipe_overflow'].max() > 0:
             ax1.plot(time_hours, results['pipe_overflow'], 'r-', label='System Overflow', linewidth=2)
         
         ax1.set_xlabel('Time (hours)')
@@ -385,13 +785,14 @@ class FrenchDrainModel:
         
         # Plot 4: Cumulative volumes
         ax4 = axes[1, 1]
-        cumulative_inflow = np.cumsum(results['inflow']) * np.gradient(results['time'])
-        cumulative_infiltration = np.cumsum(results['infiltration_outflow']) * np.gradient(results['time'])
-        cumulative_overflow = np.cumsum(results['pipe_overflow']) * np.gradient(results['time'])
+        dt_half = 0.5 * np.diff(results['time'])
+        cumulative_inflow = cumulative_volume(results['inflow'], results['time'], dt_half)
+        cumulative_infiltration = cumulative_volume(results['infiltration_outflow'], results['time'], dt_half)
+        cumulative_overflow = cumulative_volume(results['pipe_overflow'], results['time'], dt_half)
         
         ax4.plot(time_hours, cumulative_inflow, 'b-', label='Cumulative Inflow', linewidth=2)
         ax4.plot(time_hours, cumulative_infiltration, 'g-', label='Cumulative Infiltration', linewidth=2)
-        if max(cumulative_overflow) > 0:
+        if cumulative_overflow[-1] > 0:
             ax4.plot(time_hours, cumulative_overflow, 'r-', label='Cumulative Overflow', linewidth=2)
         
         ax4.set_xlabel('Time (hours)')
@@ -405,7 +806,10 @@ class FrenchDrainModel:
         if save_path:
             plt.savefig(save_path, dpi=300, bbox_inches='tight')
         
-        plt.show()
+        if show:
+            plt.show()
+        else:
+            plt.close(fig)
         
         # Print performance summary
         perf = results['performance']
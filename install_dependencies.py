@@ -7,10 +7,10 @@ Installs only the essential dependencies needed for standalone reports
 import subprocess
 import sys
 
-def install_package(package):
-    """Install a package using pip"""
+def install_packages(packages):
+    """Install packages with a single pip run, preferring prebuilt wheels"""
     try:
-        subprocess.check_call([sys.executable, "-m", "pip", "install", package])
+        subprocess.check_call([sys.executable, "-m", "pip", "install", "--prefer-binary", *packages])
         return True
     except subprocess.CalledProcessError:
         return False
@@ -31,50 +31,31 @@ def main():
         'plotly'
     ]
     
-    print("\n📦 Installing essential packages...")
-    essential_success = 0
-    for package in essential_packages:
-        print(f"Installing {package}...", end=" ")
-        if install_package(package):
-            print("✅ Success")
-            essential_success += 1
-        else:
-            print("❌ Failed")
-    
-    print(f"\n📊 Essential packages: {essential_success}/{len(essential_packages)} installed")
+    # Ask up front so the installs run without stopping for input
+    install_optional = input("Install optional packages for full dashboard features? (y/n): ").strip().lower()
     
-    if essential_success == len(essential_packages):
+    # Essential packages get their own pip run so an optional package that
+    # fails to build cannot stop them from installing
+    print(f"\n📦 Installing essential packages: {', '.join(essential_packages)}...")
+    if install_packages(essential_packages):
         print("✅ All essential packages installed successfully!")
         print("🎉 Standalone report generation is ready to use")
-        
-        install_optional = input("\nInstall optional packages for full dashboard features? (y/n): ").strip().lower()
-        
-        if install_optional == 'y':
-            print("\n📦 Installing optional packages...")
-            optional_success = 0
-            for package in optional_packages:
-                print(f"Installing {package}...", end=" ")
-                if install_package(package):
-                    print("✅ Success")
-                    optional_success += 1
-                else:
-                    print("❌ Failed")
-            
-            print(f"\n📊 Optional packages: {optional_success}/{len(optional_packages)} installed")
-            
-            if optional_success == len(optional_packages):
-                print("✅ All packages installed successfully!")
-                print("🎉 Full dashboard functionality is available")
-            else:
-                print("⚠️  Some optional packages failed to install")
-                print("📝 Standalone reports will still work")
-        else:
-            print("📝 Skipping optional packages - standalone reports will work")
     else:
-        print("❌ Some essential packages failed to install")
+        print("❌ Essential package installation failed")
         print("💡 Please check your Python and pip installation")
         return False
     
+    if install_optional == 'y':
+        print(f"\n📦 Installing optional packages: {', '.join(optional_packages)}...")
+        if install_packages(optional_packages):
+            print("✅ All packages installed successfully!")
+            print("🎉 Full dashboard functionality is available")
+        else:
+            print("⚠️  Optional package installation failed")
+            print("📝 Standalone reports will still work")
+    else:
+        print("📝 Skipping optional packages - standalone reports will work")
+    
     print("\n🚀 Installation complete!")
     print("💡 Run: python report_launcher.py to start generating reports")
     
@@ -3,75 +3,78 @@ Lightweight Engineering Report Generator
 Creates comprehensive PDF-ready reports without requiring streamlit or plotly dependencies
 """
 
-import numpy as np
+import html
+import io
+import importlib.util
 from datetime import datetime
-import math
+from functools import lru_cache
+from math import pi as _PI
 
-def generate_comprehensive_engineering_report_lightweight(soakwell_results, french_drain_results, storm_name, config, hydrograph_data):
+# numpy (and numba, which imports it) are only needed to reduce the storm series,
+# so both are imported on first use rather than at module load
+NUMBA_AVAILABLE = importlib.util.find_spec('numba') is not None
+
+def _render_table(headers, rows, indent=12, cls='parameter-table'):
     """
-    Generate a comprehensive engineering report documenting the entire analysis
-    Lightweight version that doesn't require streamlit or plotly
+    HTML table with a header row, one row per line at the given indent
     
-    Parameters:
-    soakwell_results: Results from soakwell simulation
-    french_drain_results: Results from French drain simulation  
-    storm_name: Name of the analyzed storm
-    config: Configuration parameters used
-    hydrograph_data: Original storm hydrograph data
-    
-    Returns:
-    str: Complete HTML report content suitable for PDF conversion
+    Used at import to build the report tables; cells may hold str.format_map
+    fields that are filled in per report.
     """
-    
-    # Report metadata
-    report_date = datetime.now().strftime("%Y-%m-%d")
-    report_time = datetime.now().strftime("%H:%M:%S")
-    
-    
-    html_report = f"""
+    pad = ' ' * indent
+    row_pad = pad + '    '
+    lines = [f'{pad}<table class="{cls}">',
+             row_pad + '<tr>' + ''.join(f'<th>{h}</th>' for h in headers) + '</tr>']
+    lines.extend(row_pad + '<tr>' + ''.join(f'<td>{c}</td>' for c in row) + '</tr>' for row in rows)
+    lines.append(pad + '</table>')
+    return '\n'.join(lines)
+
+# Static report content, built once at import rather than on every report
+
+_REPORT_HEAD = """
         <!DOCTYPE html>
         <html>
         <head>
             <meta charset="UTF-8">
             <title>Infiltration System Analysis Report</title>
         <style>
-            @page {{ 
+            @page { 
                 size: A4; 
                 margin: 2cm; 
-                @bottom-center {{ content: "Page " counter(page) " of " counter(pages); }}
-            }}
-            body {{ 
+                @bottom-center { content: "Page " counter(page) " of " counter(pages); }
+            }
+            body { 
                 font-family: 'Times New Roman', serif; 
                 line-height: 1.6; 
                 margin: 0; 
                 padding: 0;
                 font-size: 11pt;
                 color: #333;
-            }}
-            .header {{ 
+            }
+            .header { 
                 text-align: center; 
                 border-bottom: 3px solid #1f4e79; 
                 padding-bottom: 20px; 
                 margin-bottom: 30px;
                 page-break-after: avoid;
-            }}
-            .header h1 {{ 
+            }
+            .header h1 { 
                 color: #1f4e79; 
                 margin: 0; 
                 font-size: 24pt; 
                 font-weight: bold;
-            }}
-            .header h2 {{ 
+            }
+            .header h2 { 
                 color: #666; 
                 margin: 5px 0; 
                 font-size: 16pt; 
                 font-weight: normal;
-            }}
-            .section {{ 
+            }
+            .section { 
                 margin: 25px 0; 
                 page-break-inside: avoid;
-            }}
-            .section-title {{ 
+            }
+            .section-title { 
                 background-color: #1f4e79; 
                 color: white; 
                 padding: 12px 15px; 
@@ -79,16 +82,16 @@ def generate_comprehensive_engineering_report_lightweight(soakwell_results, fren
                 font-size: 14pt; 
                 font-weight: bold;
                 page-break-after: avoid;
-            }}
-            .subsection-title {{ 
+            }
+            .subsection-title { 
                 color: #1f4e79; 
                 font-size: 12pt; 
                 font-weight: bold; 
                 margin: 15px 0 8px 0;
                 border-bottom: 1px solid #1f4e79;
                 padding-bottom: 3px;
-            }}
-            .formula-box {{ 
+            }
+            .formula-box { 
                 background-color: #f8f9fa; 
                 border: 1px solid #dee2e6; 
                 border-left: 4px solid #1f4e79;
@@ -96,81 +99,74 @@ def generate_comprehensive_engineering_report_lightweight(soakwell_results, fren
                 margin: 15px 0; 
                 font-family: 'Courier New', monospace;
                 page-break-inside: avoid;
-            }}
-            .calculation-box {{ 
+            }
+            .calculation-box { 
                 background-color: #fff; 
                 border: 1px solid #ccc; 
                 padding: 15px; 
                 margin: 10px 0;
                 page-break-inside: avoid;
-            }}
-            .result-box {{ 
+            }
+            .result-box { 
                 background-color: #d4edda; 
                 border: 1px solid #c3e6cb; 
                 border-left: 4px solid #28a745;
                 padding: 15px; 
                 margin: 15px 0;
                 page-break-inside: avoid;
-            }}
-            .parameter-table {{ 
+            }
+            .parameter-table { 
                 width: 100%; 
                 border-collapse: collapse; 
                 margin: 15px 0;
                 font-size: 10pt;
-            }}
-            .parameter-table th, .parameter-table td {{ 
+            }
+            .parameter-table th, .parameter-table td { 
                 border: 1px solid #ddd; 
                 padding: 8px; 
                 text-align: left;
-            }}
-            .parameter-table th {{ 
+            }
+            .parameter-table th { 
                 background-color: #f8f9fa; 
                 font-weight: bold;
                 color: #1f4e79;
-            }}
-            .figure {{ 
+            }
+            .figure { 
                 text-align: center; 
                 margin: 20px 0;
                 page-break-inside: avoid;
-            }}
-            .figure-caption {{ 
+            }
+            .figure-caption { 
                 font-style: italic; 
                 margin-top: 8px; 
                 font-size: 10pt;
                 color: #666;
-            }}
-            .reference {{ 
+            }
+            .reference { 
                 font-style: italic; 
                 color: #666; 
                 margin: 10px 0;
-            }}
-            .page-break {{ 
+            }
+            .page-break { 
                 page-break-before: always; 
-            }}
-            .no-break {{ 
+            }
+            .no-break { 
                 page-break-inside: avoid; 
-            }}
-            .footer {{ 
+            }
+            .footer { 
                 margin-top: 40px; 
                 padding-top: 20px; 
                 border-top: 1px solid #ddd; 
                 text-align: center; 
                 font-size: 9pt; 
                 color: #666;
-            }}
+            }
         </style>
     </head>
     <body>
-        <div class="header">
-            <h1>INFILTRATION SYSTEM ANALYSIS REPORT</h1>
-            <h2>Soakwell and French Drain Performance Comparison</h2>
-            <p><strong>Project:</strong> North Fremantle Pedestrian Infrastructure</p>
-            <p><strong>Storm Event:</strong> {storm_name}</p>
-            <p><strong>Report Date:</strong> {report_date}</p>
-            <p><strong>Report Time:</strong> {report_time}</p>
-        </div>
+"""
 
-        <div class="section">
+_REPORT_INTRO = """        <div class="section">
             <div class="section-title">1. EXECUTIVE SUMMARY</div>
             <p>This report documents a comprehensive analysis of infiltration systems for stormwater management 
             in the North Fremantle Pedestrian Infrastructure project. The analysis compares the performance 
@@ -196,13 +192,14 @@ def generate_comprehensive_engineering_report_lightweight(soakwell_results, fren
             
             <div class="subsection-title">2.2 Design Criteria</div>
             <p>The analysis considers the following design parameters:</p>
-            <table class="parameter-table">
-                <tr><th>Parameter</th><th>Value</th><th>Source/Standard</th></tr>
-                <tr><td>Soil Permeability (k)</td><td>4.63×10⁻⁵ m/s</td><td>Site investigation data</td></tr>
-                <tr><td>Design Storm Events</td><td>Various AEP events</td><td>DRAINS model outputs</td></tr>
-                <tr><td>Safety Factor</td><td>Conservative design approach</td><td>AS/NZS 3500.3</td></tr>
-                <tr><td>Infiltration Method</td><td>Darcy's Law application</td><td>Engineering hydrology principles</td></tr>
-            </table>
+""" + _render_table(
+    ('Parameter', 'Value', 'Source/Standard'),
+    [
+        ('Soil Permeability (k)', '4.63×10⁻⁵ m/s', 'Site investigation data'),
+        ('Design Storm Events', 'Various AEP events', 'DRAINS model outputs'),
+        ('Safety Factor', 'Conservative design approach', 'AS/NZS 3500.3'),
+        ('Infiltration Method', "Darcy's Law application", 'Engineering hydrology principles'),
+    ]) + """
         </div>
 
         <div class="section">
@@ -266,81 +263,47 @@ def generate_comprehensive_engineering_report_lightweight(soakwell_results, fren
         <div class="section">
             <div class="section-title">4. STORM EVENT CHARACTERISTICS</div>
     """
-    
-    # Add storm event analysis - handle actual soakwell result structure with robust error handling
-    total_volume = 0
-    peak_inflow = 0
-    duration_hours = 0
-    
-    try:
-        if soakwell_results and isinstance(soakwell_results, dict):
-            # Try to get data from soakwell results
-            if 'cumulative_inflow' in soakwell_results and soakwell_results['cumulative_inflow']:
-                total_volume = soakwell_results['cumulative_inflow'][-1]
-            if 'inflow_rate' in soakwell_results and soakwell_results['inflow_rate']:
-                peak_inflow = max(soakwell_results['inflow_rate'])
-            if 'time_min' in soakwell_results and soakwell_results['time_min']:
-                duration_hours = max(soakwell_results['time_min']) / 60
-                
-        if (total_volume == 0 or peak_inflow == 0) and french_drain_results and isinstance(french_drain_results, dict):
-            # Try to get data from French drain results
-            if 'performance' in french_drain_results:
-                perf = french_drain_results['performance']
-                total_volume = perf.get('total_inflow_m3', 0)
-                if 'inflow' in french_drain_results:
-                    peak_inflow = max(french_drain_results['inflow']) if french_drain_results['inflow'] else 0
-                if 'time' in french_drain_results:
-                    duration_hours = max(french_drain_results['time']) / 3600 if french_drain_results['time'] else 0
-        
-        # Fallback to hydrograph data if available
-        if (total_volume == 0 or peak_inflow == 0) and hydrograph_data is not None:
-            try:
-                if hasattr(hydrograph_data, 'iloc') and len(hydrograph_data.columns) > 1:
-                    # DataFrame format
-                    peak_inflow = max(hydrograph_data.iloc[:, 1]) if len(hydrograph_data.iloc[:, 1]) > 0 else 1.0
-                    duration_hours = len(hydrograph_data) * 5 / 60  # Assuming 5-minute intervals
-                    total_volume = sum(hydrograph_data.iloc[:, 1]) * 300  # 5 minutes * 60 seconds
-                elif isinstance(hydrograph_data, dict):
-                    # Dictionary format
-                    if 'total_flow' in hydrograph_data and hydrograph_data['total_flow']:
-                        peak_inflow = max(hydrograph_data['total_flow'])
-                        duration_hours = len(hydrograph_data['total_flow']) * 5 / 60
-                        total_volume = sum(hydrograph_data['total_flow']) * 300
-                elif isinstance(hydrograph_data, (list, tuple)) and len(hydrograph_data) > 0:
-                    # List format
-                    peak_inflow = max(hydrograph_data)
-                    duration_hours = len(hydrograph_data) * 5 / 60
-                    total_volume = sum(hydrograph_data) * 300
-            except Exception as e:
-                # Use default values if hydrograph processing fails
-                peak_inflow = 1.0
-                duration_hours = 6.0
-                total_volume = 100.0
-        
-        # Ensure non-zero values for calculations
-        if total_volume <= 0:
-            total_volume = 100.0  # Default value
-        if peak_inflow <= 0:
-            peak_inflow = 1.0  # Default value  
-        if duration_hours <= 0:
-            duration_hours = 6.0  # Default value
+
+_REPORT_CONCLUSIONS = """
+        </div>
+
+        <div class="section">
+            <div class="section-title">6. CONCLUSIONS</div>
             
-    except Exception as e:
-        # Use safe defaults if any error occurs
-        total_volume = 100.0
-        peak_inflow = 1.0
-        duration_hours = 6.0
-        
-    html_report += f"""
+            <p>This comprehensive analysis has demonstrated the application of established hydraulic 
+            engineering principles to evaluate infiltration system performance for the North Fremantle 
+            Pedestrian Infrastructure project.</p>
+            
+            <p><strong>Key Findings:</strong></p>
+            <ul>
+                <li>Soakwell system provides effective stormwater management for the analyzed design storm events</li>
+                <li>Mass balance verification confirms model accuracy with errors well below 1%</li>
+                <li>System performance meets design criteria with appropriate emptying time characteristics</li>
+                <li>The analysis methodology provides a robust framework for engineering assessment</li>
+            </ul>
+            
+            <p><strong>Professional Recommendation:</strong></p>
+            <p>The analyzed system configuration is suitable for the design requirements based on the 
+            performance results documented in this report. Final design should consider site-specific 
+            factors and detailed cost analysis.</p>
+        </div>
+
+"""
+
+# Report tables, filled with str.format_map from precomputed values (any text
+# fields must already be HTML-escaped)
+
+_STORM_TABLE_TMPL = """
             <div class="subsection-title">4.1 Selected Design Storm: {storm_name}</div>
-            <table class="parameter-table">
-                <tr><th>Storm Characteristic</th><th>Value</th><th>Unit</th><th>Significance</th></tr>
-                <tr><td>Total Duration</td><td>{duration_hours:.1f}</td><td>hours</td><td>Design storm duration</td></tr>
-                <tr><td>Peak Inflow Rate</td><td>{peak_inflow*1000:.1f}</td><td>L/s</td><td>Maximum instantaneous flow</td></tr>
-                <tr><td>Total Runoff Volume</td><td>{total_volume:.1f}</td><td>m³</td><td>Total water to be managed</td></tr>
-                <tr><td>Average Intensity</td><td>{total_volume/(duration_hours*3600)*1000:.1f}</td><td>L/s</td><td>Mean flow rate</td></tr>
-                <tr><td>Peak/Average Ratio</td><td>{(peak_inflow*1000)/(total_volume/(duration_hours*3600)*1000):.1f}</td><td>-</td><td>Storm intensity variation</td></tr>
-            </table>
+""" + _render_table(
+    ('Storm Characteristic', 'Value', 'Unit', 'Significance'),
+    [
+        ('Total Duration', '{duration_hours:.1f}', 'hours', 'Design storm duration'),
+        ('Peak Inflow Rate', '{peak_inflow_ls:.1f}', 'L/s', 'Maximum instantaneous flow'),
+        ('Total Runoff Volume', '{total_volume:.1f}', 'm³', 'Total water to be managed'),
+        ('Average Intensity', '{average_flow_ls:.1f}', 'L/s', 'Mean flow rate'),
+        ('Peak/Average Ratio', '{peak_ratio:.1f}', '-', 'Storm intensity variation'),
+    ]) + """
             
             <p>This storm represents a significant design event requiring careful infiltration system sizing. 
             The high peak-to-average ratio indicates the need for adequate storage capacity to handle 
@@ -350,52 +313,20 @@ def generate_comprehensive_engineering_report_lightweight(soakwell_results, fren
         <div class="section">
             <div class="section-title">5. SOAKWELL SYSTEM ANALYSIS</div>
     """
-    
-    # Add soakwell analysis
-    if soakwell_results and isinstance(soakwell_results, dict):
-        diameter = config.get('soakwell_diameter', 2.0)
-        depth = config.get('soakwell_depth', 2.0)
-        num_soakwells = config.get('num_soakwells', 1)
-        ks = config.get('ks', 1e-5)
-        
-        # Geometry calculations
-        radius = diameter / 2
-        area = math.pi * radius**2
-        volume_per_unit = area * depth
-        total_volume_capacity = volume_per_unit * num_soakwells
-        
-        # Performance metrics - calculate from actual data arrays with error handling
-        try:
-            max_stored = max(soakwell_results.get('stored_volume', [0])) if soakwell_results.get('stored_volume') else 0
-            max_level = max(soakwell_results.get('water_level', [0])) if soakwell_results.get('water_level') else 0
-            overflow_data = soakwell_results.get('overflow_rate', [0])
-            total_overflow = sum(overflow_data) * 5 / 60 if overflow_data else 0  # Convert to m³
-            emptying_time = soakwell_results.get('emptying_time_minutes', 0)
-            mass_balance_error = soakwell_results.get('mass_balance', {}).get('mass_balance_error_percent', 0)
-            total_overflow_mb = soakwell_results.get('mass_balance', {}).get('total_overflow_m3', total_overflow)
-            max_outflow_rate = max(soakwell_results.get('outflow_rate', [0])) if soakwell_results.get('outflow_rate') else 0
-        except Exception as e:
-            # Use safe defaults if data access fails
-            max_stored = total_volume_capacity * 0.8  # 80% utilization
-            max_level = depth * 0.8
-            total_overflow = 0
-            emptying_time = 12 * 60  # 12 hours in minutes
-            mass_balance_error = 0.05
-            total_overflow_mb = 0
-            max_outflow_rate = 0.01
-        
-        html_report += f"""
+
+_SOAKWELL_CONFIG_TMPL = """
             <div class="subsection-title">5.1 System Configuration</div>
-            <table class="parameter-table">
-                <tr><th>Parameter</th><th>Value</th><th>Unit</th><th>Calculation</th></tr>
-                <tr><td>Number of Soakwells</td><td>{num_soakwells}</td><td>units</td><td>Selected configuration</td></tr>
-                <tr><td>Individual Diameter</td><td>{diameter:.1f}</td><td>m</td><td>Standard precast size</td></tr>
-                <tr><td>Individual Depth</td><td>{depth:.1f}</td><td>m</td><td>Standard precast size</td></tr>
-                <tr><td>Individual Radius</td><td>{radius:.2f}</td><td>m</td><td>r = D/2 = {diameter:.1f}/2</td></tr>
-                <tr><td>Base Area (each)</td><td>{area:.2f}</td><td>m²</td><td>A = π × r² = π × {radius:.2f}²</td></tr>
-                <tr><td>Volume (each)</td><td>{volume_per_unit:.1f}</td><td>m³</td><td>V = A × h = {area:.2f} × {depth:.1f}</td></tr>
-                <tr><td>Total System Capacity</td><td>{total_volume_capacity:.1f}</td><td>m³</td><td>{num_soakwells} × {volume_per_unit:.1f}</td></tr>
-            </table>
+""" + _render_table(
+    ('Parameter', 'Value', 'Unit', 'Calculation'),
+    [
+        ('Number of Soakwells', '{num_soakwells}', 'units', 'Selected configuration'),
+        ('Individual Diameter', '{diameter:.1f}', 'm', 'Standard precast size'),
+        ('Individual Depth', '{depth:.1f}', 'm', 'Standard precast size'),
+        ('Individual Radius', '{radius:.2f}', 'm', 'r = D/2 = {diameter:.1f}/2'),
+        ('Base Area (each)', '{area:.2f}', 'm²', 'A = π × r² = π × {radius:.2f}²'),
+        ('Volume (each)', '{volume_per_unit:.1f}', 'm³', 'V = A × h = {area:.2f} × {depth:.1f}'),
+        ('Total System Capacity', '{total_volume_capacity:.1f}', 'm³', '{num_soakwells} × {volume_per_unit:.1f}'),
+    ]) + """
             
             <div class="subsection-title">5.2 Infiltration Rate Calculations</div>
             <p><strong>Step 1: Basic Parameters</strong></p>
@@ -411,63 +342,335 @@ def generate_comprehensive_engineering_report_lightweight(soakwell_results, fren
                 Q = 2πkL(h/ln(R/r))<br><br>
                 Simplified for design (assuming R/r ≈ 10):<br>
                 Q ≈ k × A_effective × gradient_factor<br>
-                Maximum infiltration rate ≈ {max_outflow_rate*1000:.1f} L/s
+                Maximum infiltration rate ≈ {max_outflow_ls:.1f} L/s
             </div>
             
-            <div class="subsection-title">5.3 Performance Results</div>
+            """
+
+_SOAKWELL_RESULTS_TMPL = """<div class="subsection-title">5.3 Performance Results</div>
             <div class="result-box">
-                <table class="parameter-table">
-                    <tr><th>Performance Metric</th><th>Calculated Value</th><th>Assessment</th></tr>
-                    <tr><td>Maximum Storage Used</td><td>{max_stored:.1f} m³</td><td>{'✓ Within capacity' if max_stored <= total_volume_capacity else '✗ Exceeds capacity'}</td></tr>
-                    <tr><td>Maximum Water Level</td><td>{max_level:.2f} m</td><td>{'✓ Acceptable' if max_level <= depth else '✗ Exceeds depth'}</td></tr>
-                    <tr><td>Storage Utilization</td><td>{max_stored/total_volume_capacity*100:.1f}%</td><td>{'✓ Efficient' if max_stored/total_volume_capacity*100 < 80 else '⚠ High utilization'}</td></tr>
-                    <tr><td>Total Overflow</td><td>{total_overflow:.1f} m³</td><td>{'✓ No overflow' if total_overflow == 0 else '✗ System overflow'}</td></tr>
-                    <tr><td>Emptying Time</td><td>{emptying_time/60:.1f} hours</td><td>{'✓ Fast emptying' if emptying_time < 24*60 else '⚠ Slow emptying' if emptying_time < 48*60 else '✗ Very slow emptying'}</td></tr>
-                    <tr><td>Mass Balance Check</td><td>{abs(mass_balance_error):.3f}%</td><td>{'✓ Excellent' if abs(mass_balance_error) < 0.1 else '✓ Acceptable' if abs(mass_balance_error) < 1.0 else '✗ Review required'}</td></tr>
-                </table>
+""" + _render_table(
+    ('Performance Metric', 'Calculated Value', 'Assessment'),
+    [
+        ('Maximum Storage Used', '{max_stored:.1f} m³', '{storage_verdict}'),
+        ('Maximum Water Level', '{max_level:.2f} m', '{level_verdict}'),
+        ('Storage Utilization', '{utilization:.1f}%', '{utilization_verdict}'),
+        ('Total Overflow', '{total_overflow:.1f} m³', '{overflow_verdict}'),
+        ('Emptying Time', '{emptying_hours:.1f} hours', '{emptying_verdict}'),
+        ('Mass Balance Check', '{mass_balance_abs:.3f}%', '{mass_balance_verdict}'),
+    ], indent=16) + """
             </div>
         """
-        
-        if total_overflow > 0.1:
-            html_report += f"""
+
+_OVERFLOW_TMPL = """
             <div class="subsection-title">5.4 Overflow Analysis</div>
             <p><strong>⚠️ Warning:</strong> The soakwell system experiences {total_overflow:.1f} m³ of overflow 
             during the design storm event. This indicates insufficient capacity for the selected storm intensity.</p>
             
             <p><strong>Recommendations:</strong></p>
             <ul>
-                <li>Increase soakwell diameter to {diameter + 0.3:.1f} m (next standard size)</li>
-                <li>Add additional soakwell units (recommend {num_soakwells + 1} total units)</li>
+                <li>Increase soakwell diameter to {next_diameter:.1f} m (next standard size)</li>
+                <li>Add additional soakwell units (recommend {next_count} total units)</li>
                 <li>Consider hybrid system with overflow management</li>
             </ul>
             """
+
+# Performance verdicts, indexed by the assessment outcome: the pass/fail checks
+# by whether they passed, the graded ones by how many thresholds were missed
+
+_CAPACITY_VERDICT = ('✗ Exceeds capacity', '✓ Within capacity')
+_DEPTH_VERDICT = ('✗ Exceeds depth', '✓ Acceptable')
+_UTILIZATION_VERDICT = ('⚠ High utilization', '✓ Efficient')
+_OVERFLOW_VERDICT = ('✗ System overflow', '✓ No overflow')
+_EMPTYING_VERDICT = ('✓ Fast emptying', '⚠ Slow emptying', '✗ Very slow emptying')
+_MASS_BALANCE_VERDICT = ('✓ Excellent', '✓ Acceptable', '✗ Review required')
+
+
+def _as_series(values):
+    """Result series as a float array, empty when missing"""
+    import numpy as np
+    return np.asarray(values if values is not None else [], dtype=np.float64)
+
+def _peak_total_py(flow):
+    """Peak and sum of a non-empty series in a single pass"""
+    peak = flow[0]
+    total = 0.0
+    for i in range(flow.shape[0]):
+        value = flow[i]
+        total += value
+        if value > peak:
+            peak = value
+    return peak, total
+
+def _peak_total_np(flow):
+    """Peak and sum of a non-empty series (NumPy reductions without numba)"""
+    return flow.max(), flow.sum()
+
+_peak_total_impl = None
+
+def _peak_total(flow):
+    """Peak and sum of a non-empty series, compiling the numba kernel on first use"""
+    global _peak_total_impl
+    if _peak_total_impl is None:
+        if NUMBA_AVAILABLE:
+            from numba import njit
+            _peak_total_impl = njit(cache=True)(_peak_total_py)
+        else:
+            _peak_total_impl = _peak_total_np
+    return _peak_total_impl(flow)
+
+def _storm_stats_from_sources(soakwell_results, french_drain_results, hydrograph_data):
+    """
+    Raw storm (total volume m³, peak inflow m³/s, duration hours), zero where unknown
     
-    # Add conclusions and footer
-    html_report += f"""
-        </div>
+    Sources are tried in order (soakwell results, French drain results, then
+    the raw hydrograph) and the first one giving both volume and peak is used.
+    """
+    total_volume = 0
+    peak_inflow = 0
+    duration_hours = 0
+    
+    if soakwell_results and isinstance(soakwell_results, dict):
+        # Try to get data from soakwell results
+        get = soakwell_results.get
+        cumulative_inflow = _as_series(get('cumulative_inflow'))
+        inflow_rate = _as_series(get('inflow_rate'))
+        time_min = _as_series(get('time_min'))
+        if cumulative_inflow.size:
+            total_volume = cumulative_inflow[-1]
+        if inflow_rate.size:
+            peak_inflow = inflow_rate.max()
+        if time_min.size:
+            duration_hours = time_min.max() / 60
+        if total_volume != 0 and peak_inflow != 0:
+            return total_volume, peak_inflow, duration_hours
+    
+    if french_drain_results and isinstance(french_drain_results, dict) and 'performance' in french_drain_results:
+        # Try to get data from French drain results
+        total_volume = french_drain_results['performance'].get('total_inflow_m3', 0)
+        if 'inflow' in french_drain_results:
+            fd_inflow = _as_series(french_drain_results['inflow'])
+            peak_inflow = fd_inflow.max() if fd_inflow.size else 0
+        if 'time' in french_drain_results:
+            fd_time = _as_series(french_drain_results['time'])
+            duration_hours = fd_time.max() / 3600 if fd_time.size else 0
+        if total_volume != 0 and peak_inflow != 0:
+            return total_volume, peak_inflow, duration_hours
+    
+    # Fallback to hydrograph data if available
+    if hydrograph_data is None:
+        return total_volume, peak_inflow, duration_hours
+    try:
+        if hasattr(hydrograph_data, 'iloc') and len(hydrograph_data.columns) > 1:
+            # DataFrame format
+            import numpy as np
+            flow = np.ascontiguousarray(hydrograph_data.iloc[:, 1].to_numpy(dtype=np.float64))
+            peak_inflow, total_flow = _peak_total(flow) if flow.size > 0 else (1.0, 0.0)
+            duration_hours = len(hydrograph_data) * 5 / 60  # Assuming 5-minute intervals
+            total_volume = total_flow * 300  # 5 minutes * 60 seconds
+        elif isinstance(hydrograph_data, dict):
+            # Dictionary format
+            flow = _as_series(hydrograph_data.get('total_flow'))
+            if flow.size:
+                peak_inflow, total_flow = _peak_total(flow)
+                duration_hours = flow.size * 5 / 60
+                total_volume = total_flow * 300
+        elif isinstance(hydrograph_data, (list, tuple)) and len(hydrograph_data) > 0:
+            # List format
+            flow = _as_series(hydrograph_data)
+            peak_inflow, total_flow = _peak_total(flow)
+            duration_hours = flow.size * 5 / 60
+            total_volume = total_flow * 300
+    except Exception:
+        # Use default values if hydrograph processing fails
+        return 100.0, 1.0, 6.0
+    
+    return total_volume, peak_inflow, duration_hours
 
-        <div class="section">
-            <div class="section-title">6. CONCLUSIONS</div>
-            
-            <p>This comprehensive analysis has demonstrated the application of established hydraulic 
-            engineering principles to evaluate infiltration system performance for the North Fremantle 
-            Pedestrian Infrastructure project.</p>
-            
-            <p><strong>Key Findings:</strong></p>
-            <ul>
-                <li>Soakwell system provides effective stormwater management for the analyzed design storm events</li>
-                <li>Mass balance verification confirms model accuracy with errors well below 1%</li>
-                <li>System performance meets design criteria with appropriate emptying time characteristics</li>
-                <li>The analysis methodology provides a robust framework for engineering assessment</li>
-            </ul>
-            
-            <p><strong>Professional Recommendation:</strong></p>
-            <p>The analyzed system configuration is suitable for the design requirements based on the 
-            performance results documented in this report. Final design should consider site-specific 
-            factors and detailed cost analysis.</p>
+def _extract_storm_stats(soakwell_results, french_drain_results, hydrograph_data):
+    """
+    Storm (total volume m³, peak inflow m³/s, duration hours) for the report
+    
+    Missing or unusable values fall back to safe defaults so the storm table
+    can always be rendered.
+    """
+    try:
+        total_volume, peak_inflow, duration_hours = _storm_stats_from_sources(
+            soakwell_results, french_drain_results, hydrograph_data)
+    except Exception:
+        # Use safe defaults if any error occurs
+        return 100.0, 1.0, 6.0
+    
+    # Ensure non-zero values for calculations
+    return (100.0 if total_volume <= 0 else total_volume,
+            1.0 if peak_inflow <= 0 else peak_inflow,
+            6.0 if duration_hours <= 0 else duration_hours)
+
+def _soakwell_figures(soakwell_results, config):
+    """
+    Soakwell figures for the report: diameter m, depth m, number of units,
+    ks m/s, max stored m³, max level m, total overflow m³, emptying time
+    minutes, mass balance error % and max outflow m³/s
+    """
+    diameter = config.get('soakwell_diameter', 2.0)
+    depth = config.get('soakwell_depth', 2.0)
+    num_soakwells = config.get('num_soakwells', 1)
+    ks = config.get('ks', 1e-5)
+    
+    # Performance metrics - calculate from actual data arrays with error handling
+    try:
+        stored_volume = _as_series(soakwell_results.get('stored_volume'))
+        water_level = _as_series(soakwell_results.get('water_level'))
+        overflow_data = _as_series(soakwell_results.get('overflow_rate'))
+        outflow_rate = _as_series(soakwell_results.get('outflow_rate'))
+        max_stored = stored_volume.max() if stored_volume.size else 0
+        max_level = water_level.max() if water_level.size else 0
+        total_overflow = overflow_data.sum() * 5 / 60 if overflow_data.size else 0  # Convert to m³
+        emptying_time = soakwell_results.get('emptying_time_minutes', 0)
+        mass_balance_error = soakwell_results.get('mass_balance', {}).get('mass_balance_error_percent', 0)
+        max_outflow_rate = outflow_rate.max() if outflow_rate.size else 0
+    except Exception as e:
+        # Use safe defaults if data access fails
+        radius = diameter / 2
+        max_stored = _PI * radius * radius * depth * num_soakwells * 0.8  # 80% utilization
+        max_level = depth * 0.8
+        total_overflow = 0
+        emptying_time = 12 * 60  # 12 hours in minutes
+        mass_balance_error = 0.05
+        max_outflow_rate = 0.01
+    
+    return (diameter, depth, num_soakwells, ks, max_stored, max_level,
+            total_overflow, emptying_time, mass_balance_error, max_outflow_rate)
+
+@lru_cache(maxsize=8, typed=True)
+def _render_analysis(storm_name, total_volume, peak_inflow, duration_hours, *soakwell):
+    """
+    Storm and soakwell analysis sections (4.1 to 5.4) of the report
+    
+    Rendered from the extracted figures only, so repeat reports for the same
+    storm and configuration (UI re-renders, test suites) reuse the HTML.
+    The soakwell sections are omitted when no soakwell figures are given.
+    """
+    buf = io.StringIO()
+    peak_inflow_ls = peak_inflow*1000
+    average_flow_ls = total_volume/(duration_hours*3600)*1000
+    buf.write(_STORM_TABLE_TMPL.format_map({
+        'storm_name': storm_name,
+        'duration_hours': duration_hours,
+        'peak_inflow_ls': peak_inflow_ls,
+        'total_volume': total_volume,
+        'average_flow_ls': average_flow_ls,
+        'peak_ratio': peak_inflow_ls/average_flow_ls,
+    }))
+    
+    if not soakwell:
+        return buf.getvalue()
+    (diameter, depth, num_soakwells, ks, max_stored, max_level,
+     total_overflow, emptying_time, mass_balance_error, max_outflow_rate) = soakwell
+    
+    # Geometry calculations
+    radius = diameter / 2
+    area = _PI * radius * radius
+    volume_per_unit = area * depth
+    total_volume_capacity = volume_per_unit * num_soakwells
+    
+    buf.write(_SOAKWELL_CONFIG_TMPL.format_map({
+        'num_soakwells': num_soakwells,
+        'diameter': diameter,
+        'depth': depth,
+        'radius': radius,
+        'area': area,
+        'volume_per_unit': volume_per_unit,
+        'total_volume_capacity': total_volume_capacity,
+        'ks': ks,
+        'max_outflow_ls': max_outflow_rate*1000,
+    }))
+    
+    utilization = max_stored/total_volume_capacity*100
+    mass_balance_abs = abs(mass_balance_error)
+    buf.write(_SOAKWELL_RESULTS_TMPL.format_map({
+        'max_stored': max_stored,
+        'storage_verdict': _CAPACITY_VERDICT[int(max_stored <= total_volume_capacity)],
+        'max_level': max_level,
+        'level_verdict': _DEPTH_VERDICT[int(max_level <= depth)],
+        'utilization': utilization,
+        'utilization_verdict': _UTILIZATION_VERDICT[int(utilization < 80)],
+        'total_overflow': total_overflow,
+        'overflow_verdict': _OVERFLOW_VERDICT[int(total_overflow == 0)],
+        'emptying_hours': emptying_time/60,
+        'emptying_verdict': _EMPTYING_VERDICT[2 - int(emptying_time < 24*60) - int(emptying_time < 48*60)],
+        'mass_balance_abs': mass_balance_abs,
+        'mass_balance_verdict': _MASS_BALANCE_VERDICT[2 - int(mass_balance_abs < 0.1) - int(mass_balance_abs < 1.0)],
+    }))
+    
+    if total_overflow > 0.1:
+        buf.write(_OVERFLOW_TMPL.format_map({
+            'total_overflow': total_overflow,
+            'next_diameter': diameter + 0.3,
+            'next_count': num_soakwells + 1,
+        }))
+    
+    return buf.getvalue()
+
+def generate_comprehensive_engineering_report_lightweight(soakwell_results, french_drain_results, storm_name, config, hydrograph_data, out=None):
+    """
+    Generate a comprehensive engineering report documenting the entire analysis
+    Lightweight version that doesn't require streamlit or plotly
+    
+    Parameters:
+    soakwell_results: Results from soakwell simulation
+    french_drain_results: Results from French drain simulation  
+    storm_name: Name of the analyzed storm
+    config: Configuration parameters used
+    hydrograph_data: Original storm hydrograph data
+    out: Optional text file-like object; the report is written to it as it is built
+    
+    Returns:
+    str: Complete HTML report content suitable for PDF conversion, or None when
+    written to out
+    """
+    
+    # Report metadata
+    # One timestamp, so date and time cannot straddle midnight
+    now = datetime.now()
+    report_date = now.strftime("%Y-%m-%d")
+    report_time = now.strftime("%H:%M:%S")
+    # The storm name is the only caller-supplied text in the report
+    storm_name = html.escape(str(storm_name), quote=False)
+    
+    
+    buf = io.StringIO() if out is None else out
+    buf.write(_REPORT_HEAD)
+    buf.write(f"""        <div class="header">
+            <h1>INFILTRATION SYSTEM ANALYSIS REPORT</h1>
+            <h2>Soakwell and French Drain Performance Comparison</h2>
+            <p><strong>Project:</strong> North Fremantle Pedestrian Infrastructure</p>
+            <p><strong>Storm Event:</strong> {storm_name}</p>
+            <p><strong>Report Date:</strong> {report_date}</p>
+            <p><strong>Report Time:</strong> {report_time}</p>
         </div>
 
-        <div class="footer">
+""")
+    buf.write(_REPORT_INTRO)
+    
+    # Add storm event analysis - handle actual soakwell result structure with robust error handling
+    analysis = _extract_storm_stats(soakwell_results, french_drain_results, hydrograph_data)
+    
+    # Add soakwell analysis
+    if soakwell_results and isinstance(soakwell_results, dict):
+        analysis += _soakwell_figures(soakwell_results, config)
+    
+    render_analysis = _render_analysis
+    try:
+        hash((storm_name, analysis))
+    except TypeError:
+        # Unhashable figures (e.g. odd config values) are rendered uncached
+        render_analysis = _render_analysis.__wrapped__
+    buf.write(render_analysis(storm_name, *analysis))
+    
+    # Add conclusions and footer
+    buf.write(_REPORT_CONCLUSIONS)
+    buf.write(f"""        <div class="footer">
             <p><strong>Report prepared by:</strong> Lightweight Engineering Report Generator v1.0</p>
             <p><strong>Analysis Date:</strong> {report_date} {report_time}</p>
             <p><strong>Disclaimer:</strong> This report is for preliminary design purposes only. 
@@ -475,9 +678,10 @@ def generate_comprehensive_engineering_report_lightweight(soakwell_results, fren
         </div>
     </body>
     </html>
-    """
+    """)
     
-    return html_report
+    if out is None:
+        return buf.getvalue()
 
 # Alias for backward compatibility
 generate_comprehensive_engineering_report = generate_comprehensive_engineering_report_lightweight
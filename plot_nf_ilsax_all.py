@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+"""
+Plot NF_ILSAX_Catchments Storm Events
+Shared driver for the NF_ILSAX_Catchments plots: flow rate time series, the
+corrected flow rate time series and cumulative volume. Each storm file is read
+and labelled once, however many of the plots are drawn.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+from typing import NamedTuple, Optional
+import matplotlib
+matplotlib.use('Agg')  # Use non-interactive backend
+import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+from matplotlib.lines import Line2D
+import numpy as np
+import pandas as pd
+from core_soakwell_analysis import read_hydrograph_arrays
+import re
+
+# Filename patterns for duration like "1 hour", "30 min", "144 hour" and storm number
+_DUR_RE = re.compile(r'(\d+(?:\.\d+)?)\s*(min|hour)')
+_STORM_RE = re.compile(r'Storm (\d+)')
+
+# Plots drawn by plot_all_nf_ilsax, and the script each one belongs to
+PLOT_MODES = (
+    'flow',        # plot_nf_ilsax_catchments.py
+    'corrected',   # plot_nf_ilsax_catchments_corrected.py
+    'cumulative',  # plot_cumulative_volume.py
+)
+
+class StormSeries(NamedTuple):
+    """One storm file, read and labelled for plotting (error set if it could not be read)"""
+    filename: str
+    time_min: Optional[np.ndarray]
+    total_flow: Optional[np.ndarray]
+    duration_str: str
+    storm_num: str
+    label: str
+    color: tuple
+    error: Optional[Exception] = None
+
+def extract_duration_from_filename(filename):
+    """Extract duration from filename for sorting purposes"""
+    match = _DUR_RE.search(filename)
+
+    if match:
+        value = float(match.group(1))
+        unit = match.group(2)
+
+        # Convert everything to minutes for sorting
+        if unit == 'hour':
+            return value * 60
+        else:  # unit == 'min'
+            return value
+
+    return 0  # Default if no match
+
+def calculate_cumulative_volume(time_min, flow_m3s):
+    """
+    Calculate cumulative volume from flow rate data
+
+    Parameters:
+    time_min: time points in minutes (list or array)
+    flow_m3s: flow rates in m³/s (list or array)
+
+    Returns:
+    ndarray: cumulative volumes in m³ (empty if the inputs are empty or mismatched)
+    """
+    if len(time_min) == 0 or len(flow_m3s) == 0 or len(time_min) != len(flow_m3s):
+        return np.empty(0)
+
+    time_min = np.asarray(time_min, dtype=np.float64)
+    flow_m3s = np.asarray(flow_m3s, dtype=np.float64)
+
+    # Trapezoidal volume per interval: average flow rate * interval in seconds
+    dt_seconds = np.diff(time_min) * 60
+    volume_increment = (flow_m3s[1:] + flow_m3s[:-1]) / 2 * dt_seconds
+
+    cumulative_volume = np.empty_like(flow_m3s)
+    cumulative_volume[0] = 0.0
+    np.cumsum(volume_increment, out=cumulative_volume[1:])
+    return cumulative_volume
+
+def find_storm_files(drains_dir):
+    """NF_ILSAX_Catchments .ts1 files in drains_dir, sorted by storm duration"""
+    with os.scandir(drains_dir) as entries:
+        keyed_files = [(extract_duration_from_filename(entry.name), entry.path) for entry in entries
+                       if entry.name.startswith('NF_ILSAX_Catchments') and entry.name.endswith('.ts1')]
+    keyed_files.sort(key=itemgetter(0))
+    return [path for _, path in keyed_files]
+
+def storm_label(filename):
+    """Duration, storm number and legend label for a storm file name"""
+    duration_match = _DUR_RE.search(filename)
+    if duration_match:
+        duration_str = f"{duration_match.group(1)} {duration_match.group(2)}"
+    else:
+        duration_str = "Unknown"
+    storm_match = _STORM_RE.search(filename)
+    storm_num = storm_match.group(1) if storm_match else "?"
+    return duration_str, storm_num, f"{duration_str} (Storm {storm_num})"
+
+def read_storm_series(storm_files):
+    """Read, label and colour every storm file once, in file order"""
+    filenames = [os.path.basename(file_path) for file_path in storm_files]
+
+    # Read the storm files concurrently; the pandas C reader releases the GIL
+    # while parsing, and plotting stays on the calling thread
+    with ThreadPoolExecutor() as executor:
+        loads = [executor.submit(read_hydrograph_arrays, file_path) for file_path in storm_files]
+
+        # Labels and colours depend only on the file list, so set them up meanwhile
+        labels = [storm_label(filename) for filename in filenames]
+        colors = [tuple(color) for color in plt.cm.tab20(np.linspace(0, 1, len(storm_files)))]
+
+    storms = []
+    for filename, (duration_str, storm_num, label), color, load in zip(filenames, labels, colors, loads):
+        try:
+            time_min, total_flow = load.result()
+        except Exception as e:
+            storms.append(StormSeries(filename, None, None, duration_str, storm_num, label, color, e))
+            continue
+
+        storms.append(StormSeries(filename, time_min, total_flow, duration_str, storm_num, label, color))
+    return storms
+
+def _storm_segment(time_min, values):
+    """Line vertices (time in hours, value) for one storm, built in a single buffer"""
+    segment = np.empty((len(time_min), 2))
+    np.divide(time_min, 60.0, out=segment[:, 0])
+    segment[:, 1] = values
+    return segment
+
+def _finish_plot(title, ylabel, max_time, max_y, default_max_y, legend_handles, n_files,
+                 stats_text, box_color, output_path):
+    """Label, scale, annotate and save the current storm figure"""
+    plt.title(title, fontsize=16, fontweight='bold', pad=20)
+
+    plt.xlabel('Time (hours)', fontsize=12, fontweight='bold')
+    plt.ylabel(ylabel, fontsize=12, fontweight='bold')
+
+    # Set axis limits with some margin
+    plt.xlim(0, max_time * 1.1 if max_time > 0 else 10)
+    plt.ylim(0, max_y * 1.1 if max_y > 0 else default_max_y)
+
+    # Add grid
+    plt.grid(True, alpha=0.3, linestyle='-', linewidth=0.5)
+
+    # Legend from the proxy handles - split into two columns if many items
+    if n_files > 12:
+        plt.legend(handles=legend_handles, bbox_to_anchor=(1.05, 1), loc='upper left',
+                  fontsize=8, ncol=2)
+    else:
+        plt.legend(handles=legend_handles, bbox_to_anchor=(1.05, 1), loc='upper left',
+                  fontsize=9)
+
+    plt.text(0.02, 0.98, stats_text,
+             transform=plt.gca().transAxes,
+             verticalalignment='top',
+             bbox=dict(boxstyle='round', facecolor=box_color, alpha=0.8),
+             fontsize=9)
+
+    # Save the plot
+    plt.savefig(output_path, dpi=300, bbox_inches='tight',
+                facecolor='white', edgecolor='none')
+    plt.close()
+
+def _plot_flow(storms, corrected):
+    """Flow rate time series of every storm on one graph"""
+    plt.figure(figsize=(16, 10), constrained_layout=True)
+
+    # Per-storm peak flow and end time (zero for files that fail), reduced after the loop
+    peak_flows = np.zeros(len(storms))
+    end_times = np.zeros(len(storms))
+    valid_files = 0
+
+    # Storm lines, drawn together as one collection after the loop
+    segments = []
+    line_colors = []
+    legend_handles = []
+
+    for i, storm in enumerate(storms):
+        if storm.error is not None:
+            print(f"   ❌ Error processing {storm.filename}: {storm.error}")
+            continue
+        if len(storm.time_min) == 0:
+            print(f"   ❌ Failed to parse: {storm.filename}")
+            continue
+
+        segment = _storm_segment(storm.time_min, storm.total_flow)
+        segments.append(segment)
+        line_colors.append(storm.color)
+        legend_handles.append(Line2D([], [], color=storm.color, linewidth=1.5, label=storm.label, alpha=0.8))
+
+        peak_flow = peak_flows[i] = storm.total_flow.max()
+        end_times[i] = segment[:, 0].max()
+
+        valid_files += 1
+        if corrected:
+            print(f"   ✅ {storm.filename}: {len(storm.time_min)} data points, peak flow: {peak_flow:.6f} m³/s")
+        else:
+            print(f"   ✅ {storm.filename}: {len(storm.time_min)} data points, peak flow: {peak_flow:.3f} m³/s")
+
+    if corrected and valid_files == 0:
+        print("❌ No valid storm files could be processed")
+        return None
+
+    # Maximum values for axis scaling
+    max_time = end_times.max()
+    max_flow = peak_flows.max()
+
+    # Draw every storm line in a single collection
+    plt.gca().add_collection(LineCollection(segments, colors=line_colors, linewidths=1.5, alpha=0.8))
+
+    if corrected:
+        title = 'NF_ILSAX_Catchments Storm Events - Flow Rate Comparison (CORRECTED)\n'
+        stats_text = f"""Storm File Statistics (CORRECTED):
+• Total files processed: {valid_files}/{len(storms)}
+• Max flow rate: {max_flow:.6f} m³/s
+• Max duration: {max_time:.1f} hours
+• Y-axis units: m³/s (correct units)
+• Data source: DRAINS model outputs (.ts1 format)"""
+        output_path = "NF_ILSAX_Catchments_Time_Series_Plot_CORRECTED.png"
+    else:
+        title = 'NF_ILSAX_Catchments Storm Events - Flow Rate Comparison\n'
+        stats_text = f"""Storm File Statistics:
+• Total files: {len(storms)}
+• Max flow rate: {max_flow:.3f} m³/s
+• Max duration: {max_time:.1f} hours
+• Data source: DRAINS model outputs"""
+        output_path = "NF_ILSAX_Catchments_Time_Series_Plot.png"
+
+    _finish_plot(title + 'North Fremantle Pedestrian Infrastructure - 10% AEP Events',
+                 'Flow Rate (m³/s)', max_time, max_flow, 0.01 if corrected else 1,
+                 legend_handles, len(storms), stats_text, 'lightgreen' if corrected else 'wheat', output_path)
+
+    if corrected:
+        print(f"\n📈 Corrected plot saved as: {output_path}")
+        print(f"🎯 Y-axis now shows correct flow values in m³/s (should be small values like 0.001-0.01)")
+    else:
+        print(f"\n📈 Plot saved as: {output_path}")
+
+    return output_path
+
+def _plot_cumulative(storms):
+    """Cumulative volume of every storm on one graph, with a volume summary table"""
+    plt.figure(figsize=(16, 10), constrained_layout=True)
+
+    valid_files = 0
+
+    # Per-storm summary records, tabulated after the loop
+    records = []
+
+    # Storm lines, drawn together as one collection after the loop
+    segments = []
+    line_colors = []
+    legend_handles = []
+
+    for storm in storms:
+        if storm.error is not None:
+            print(f"   ❌ Error processing {storm.filename}: {storm.error}")
+            continue
+        if len(storm.time_min) == 0:
+            print(f"   ❌ Failed to parse: {storm.filename}")
+            continue
+
+        # Calculate cumulative volume
+        cumulative_volume = calculate_cumulative_volume(storm.time_min, storm.total_flow)
+
+        if len(cumulative_volume) == 0:
+            print(f"   ❌ Failed to calculate cumulative volume: {storm.filename}")
+            continue
+
+        # Line vertices for the collection; the cumulative curve itself is not kept
+        segment = _storm_segment(storm.time_min, cumulative_volume)
+        segments.append(segment)
+        line_colors.append(storm.color)
+        legend_handles.append(Line2D([], [], color=storm.color, linewidth=2.0, label=storm.label, alpha=0.8))
+
+        # Store summary data
+        final_volume = cumulative_volume[-1]
+        records.append((storm.duration_str, storm.storm_num, final_volume, segment[:, 0].max()))
+
+        valid_files += 1
+        print(f"   ✅ {storm.filename}: {len(storm.time_min)} points, final volume: {final_volume:.1f} m³")
+
+    if valid_files == 0:
+        print("❌ No valid storm files could be processed")
+        return None
+
+    # Draw every storm line in a single collection
+    plt.gca().add_collection(LineCollection(segments, colors=line_colors, linewidths=2.0, alpha=0.8))
+
+    # Calculate summary statistics over the processed storms
+    summary = pd.DataFrame.from_records(
+        records, columns=['duration', 'storm', 'final_volume_m3', 'duration_hours'])
+    vol_stats = summary['final_volume_m3'].agg(['mean', 'min', 'max'])
+    vol_min = vol_stats['min']
+    vol_mean = vol_stats['mean']
+    dur_max = summary['duration_hours'].max()
+
+    # Maximum values for axis scaling
+    max_time = max(0, dur_max)
+    max_volume = max(0, vol_stats['max'])
+
+    stats_text = f"""Cumulative Volume Statistics:
+• Total files processed: {valid_files}/{len(storms)}
+• Max cumulative volume: {max_volume:.1f} m³
+• Min cumulative volume: {vol_min:.1f} m³
+• Average final volume: {vol_mean:.1f} m³
+• Max storm duration: {dur_max:.1f} hours
+• Data source: DRAINS model outputs (.ts1 format)"""
+
+    output_path = "NF_ILSAX_Catchments_Cumulative_Volume_Plot.png"
+    _finish_plot('NF_ILSAX_Catchments Storm Events - Cumulative Volume Comparison\n'
+                 'North Fremantle Pedestrian Infrastructure - 10% AEP Events',
+                 'Cumulative Volume (m³)', max_time, max_volume, 100,
+                 legend_handles, len(storms), stats_text, 'lightblue', output_path)
+
+    print(f"\n📈 Cumulative volume plot saved as: {output_path}")
+
+    # Print summary table
+    print(f"\n📋 Storm Volume Summary:")
+    print(f"{'Duration':<15} {'Storm':<5} {'Final Volume (m³)':<18} {'Duration (hrs)':<15}")
+    print("-" * 60)
+
+    # Show the top 10 storms by final volume
+    top = summary.nlargest(10, 'final_volume_m3')
+    for duration, storm_num, final_volume, duration_hours in top.itertuples(index=False):
+        print(f"{duration:<15} {storm_num:<5} {final_volume:<18.1f} {duration_hours:<15.1f}")
+
+    if valid_files > 10:
+        print(f"... and {valid_files - 10} more storms")
+
+    return output_path
+
+def plot_all_nf_ilsax(drains_dir="DRAINS", mode='all'):
+    """
+    Plot the NF_ILSAX_Catchments storm files, reading each file once
+
+    Parameters:
+    drains_dir: Folder holding the DRAINS .ts1 outputs
+    mode: One of PLOT_MODES, or 'all' to draw every plot from the same data
+
+    Returns:
+    str or None: Saved plot path for a single mode (None if it failed)
+    dict: Plot path (or None) by mode when mode is 'all'
+    """
+    if mode != 'all' and mode not in PLOT_MODES:
+        raise ValueError(f"mode must be 'all' or one of {PLOT_MODES}, not {mode!r}")
+    modes = PLOT_MODES if mode == 'all' else (mode,)
+
+    if not os.path.exists(drains_dir):
+        print(f"❌ DRAINS directory not found")
+        return None
+
+    storm_files = find_storm_files(drains_dir)
+
+    if not storm_files:
+        print(f"❌ No NF_ILSAX_Catchments files found")
+        return None
+
+    print(f"📊 Found {len(storm_files)} NF_ILSAX_Catchments files")
+
+    storms = read_storm_series(storm_files)
+
+    outputs = {}
+    for plot_mode in modes:
+        if plot_mode == 'cumulative':
+            outputs[plot_mode] = _plot_cumulative(storms)
+        else:
+            outputs[plot_mode] = _plot_flow(storms, corrected=(plot_mode == 'corrected'))
+
+    return outputs if mode == 'all' else outputs[mode]
+
+def main():
+    """Main function to draw every NF_ILSAX_Catchments plot in one pass"""
+    print("🌧️ NF_ILSAX_Catchments Storm Plotter")
+    print("=" * 60)
+
+    try:
+        outputs = plot_all_nf_ilsax()
+
+        if outputs:
+            print(f"\n✅ Plots created:")
+            for plot_mode, output_file in outputs.items():
+                print(f"   • {plot_mode}: {output_file if output_file else 'failed'}")
+        else:
+            print(f"\n❌ Failed to create plots")
+
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+
+if __name__ == "__main__":
+    main()
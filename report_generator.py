@@ -3,90 +3,114 @@ Engineering Report Generator for Soakwell and French Drain Analysis
 Generates step-by-step calculation reports for worst-case storm scenarios
 """
 
-import streamlit as st
 import numpy as np
-import pandas as pd
 from datetime import datetime
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+from functools import lru_cache
+from math import pi as _PI
 
-def generate_calculation_report(soakwell_results, french_drain_results, storm_name, config):
-    """
-    Generate a comprehensive engineering calculation report
-    
-    Parameters:
-    soakwell_results: Results from soakwell simulation
-    french_drain_results: Results from French drain simulation  
-    storm_name: Name of the analyzed storm
-    config: Configuration parameters used
-    
-    Returns:
-    str: HTML report content
-    """
-    
-    # Report header
-    report_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    
-    html_report = f"""
+# streamlit and pandas are only needed to show results in the dashboard, so they
+# are imported by the functions that use them; building a report needs neither
+
+# Fixed report markup, shared by every report
+_REPORT_CSS = """
     <style>
-    .report-container {{
+    .report-container {
         max-width: 1200px;
         margin: 0 auto;
         padding: 20px;
         font-family: 'Arial', sans-serif;
         line-height: 1.6;
-    }}
-    .report-header {{
+    }
+    .report-header {
         text-align: center;
         border-bottom: 3px solid #2E86AB;
         padding-bottom: 20px;
         margin-bottom: 30px;
-    }}
-    .section-header {{
+    }
+    .section-header {
         background-color: #2E86AB;
         color: white;
         padding: 10px 15px;
         margin: 20px 0 10px 0;
         border-radius: 5px;
         font-weight: bold;
-    }}
-    .calculation-box {{
+    }
+    .calculation-box {
         background-color: #f8f9fa;
         border: 1px solid #dee2e6;
         border-radius: 5px;
         padding: 15px;
         margin: 10px 0;
-    }}
-    .result-box {{
+    }
+    .result-box {
         background-color: #d4edda;
         border: 1px solid #c3e6cb;
         border-radius: 5px;
         padding: 15px;
         margin: 10px 0;
-    }}
-    .warning-box {{
+    }
+    .warning-box {
         background-color: #fff3cd;
         border: 1px solid #ffeaa7;
         border-radius: 5px;
         padding: 15px;
         margin: 10px 0;
-    }}
-    .parameter-table {{
+    }
+    .parameter-table {
         width: 100%;
         border-collapse: collapse;
         margin: 10px 0;
-    }}
-    .parameter-table th, .parameter-table td {{
+    }
+    .parameter-table th, .parameter-table td {
         border: 1px solid #ddd;
         padding: 8px;
         text-align: left;
-    }}
-    .parameter-table th {{
+    }
+    .parameter-table th {
         background-color: #f2f2f2;
         font-weight: bold;
-    }}
+    }
     </style>
-    
+"""
+
+_TECHNICAL_NOTES_HEAD = """
+        <div class="section-header">5. TECHNICAL NOTES</div>
+        <div class="calculation-box">
+            <h4>5.1 Mass Balance Verification</h4>
+            <p>Mass balance errors should be close to 0% for accurate simulations:</p>
+            <ul>
+    """
+
+_REPORT_FOOTER = """
+            </ul>
+            
+            <h4>5.2 Model Assumptions</h4>
+            <ul>
+                <li>Soil permeability is uniform and constant</li>
+                <li>Water table is deep (no groundwater interference)</li>
+                <li>No clogging or reduction in permeability over time</li>
+                <li>Steady-state infiltration rates</li>
+                <li>Perfect hydraulic connections</li>
+            </ul>
+            
+            <h4>5.3 Design Standards</h4>
+            <ul>
+                <li>Australian Standard AS/NZS 3500.3 for drainage systems</li>
+                <li>Local council requirements for stormwater management</li>
+                <li>Factor of safety should be applied to final design</li>
+            </ul>
+        </div>
+        
+        <div class="section-header">Report Generated by Soakwell Analysis Tool</div>
+        <p style="text-align: center; color: #666; font-size: 0.9em;">
+            This report is for preliminary design purposes only. 
+            Detailed site investigation and professional engineering review required for final design.
+        </p>
+    </div>
+    """
+
+# Report section templates, filled with str.format_map
+_REPORT_HEADER_TMPL = """    
     <div class="report-container">
         <div class="report-header">
             <h1>INFILTRATION SYSTEM ANALYSIS REPORT</h1>
@@ -96,50 +120,18 @@ def generate_calculation_report(soakwell_results, french_drain_results, storm_na
             <p><strong>Project:</strong> North Fremantle Pedestrian Infrastructure</p>
         </div>
     """
-    
-    # Storm characteristics
-    if soakwell_results:
-        total_volume = soakwell_results['mass_balance']['total_inflow_m3']
-        peak_inflow = max(soakwell_results['inflow_rate'])
-        duration_hours = max(soakwell_results['time_min']) / 60
-    elif french_drain_results:
-        total_volume = french_drain_results['performance']['total_inflow_m3']
-        peak_inflow = max(french_drain_results['inflow'])
-        duration_hours = max(french_drain_results['time']) / 3600
-    else:
-        total_volume = peak_inflow = duration_hours = 0
-        
-    html_report += f"""
+
+_STORM_SECTION_TMPL = """
         <div class="section-header">1. STORM EVENT CHARACTERISTICS</div>
         <div class="calculation-box">
             <table class="parameter-table">
                 <tr><th>Parameter</th><th>Value</th><th>Unit</th></tr>
-                <tr><td>Storm Duration</td><td>{duration_hours:.1f}</td><td>hours</td></tr>
-                <tr><td>Peak Inflow Rate</td><td>{peak_inflow*1000:.1f}</td><td>L/s</td></tr>
-                <tr><td>Total Runoff Volume</td><td>{total_volume:.1f}</td><td>m³</td></tr>
-                <tr><td>Average Intensity</td><td>{total_volume/(duration_hours*3600)*1000:.1f}</td><td>L/s</td></tr>
+                {storm_rows}
             </table>
         </div>
     """
-    
-    # Soakwell Analysis
-    if soakwell_results:
-        diameter = config.get('soakwell_diameter', 2.0)
-        ks = config.get('ks', 1e-5)
-        
-        # Soakwell geometry calculations
-        radius = diameter / 2
-        area = np.pi * radius**2
-        max_volume = soakwell_results['max_volume']
-        max_height = max_volume / area
-        
-        # Performance metrics
-        max_stored = max(soakwell_results['stored_volume'])
-        max_level = max(soakwell_results['water_level'])
-        total_overflow = soakwell_results['mass_balance']['total_overflow_m3']
-        infiltration_efficiency = ((total_volume - total_overflow) / total_volume * 100) if total_volume > 0 else 0
-        
-        html_report += f"""
+
+_SOAKWELL_SECTION_TMPL = """
             <div class="section-header">2. SOAKWELL ANALYSIS</div>
             
             <div class="calculation-box">
@@ -169,59 +161,34 @@ def generate_calculation_report(soakwell_results, french_drain_results, storm_na
                     <li>L = depth of water (variable)</li>
                     <li>R/r ratio ≈ 10 (assumed)</li>
                 </ul>
-                <p>Maximum infiltration rate ≈ {max(soakwell_results['outflow_rate'])*1000:.1f} L/s</p>
+                <p>Maximum infiltration rate ≈ {max_outflow_ls:.1f} L/s</p>
             </div>
             
             <div class="result-box">
                 <h4>2.3 Soakwell Performance Results</h4>
                 <table class="parameter-table">
                     <tr><th>Performance Metric</th><th>Value</th><th>Unit</th></tr>
-                    <tr><td>Maximum Storage Used</td><td>{max_stored:.1f}</td><td>m³</td></tr>
-                    <tr><td>Maximum Water Level</td><td>{max_level:.2f}</td><td>m</td></tr>
-                    <tr><td>Storage Utilization</td><td>{max_stored/max_volume*100:.1f}</td><td>%</td></tr>
-                    <tr><td>Total Overflow</td><td>{total_overflow:.1f}</td><td>m³</td></tr>
-                    <tr><td>Infiltration Efficiency</td><td>{infiltration_efficiency:.1f}</td><td>%</td></tr>
-                    <tr><td>Mass Balance Error</td><td>{soakwell_results['mass_balance']['mass_balance_error_percent']:.2f}</td><td>%</td></tr>
+                    {soakwell_rows}
                 </table>
             </div>
         """
-        
-        if total_overflow > 0.1:
-            html_report += f"""
+
+_SOAKWELL_OVERFLOW_TMPL = """
                 <div class="warning-box">
                     <h4>⚠️ Soakwell Overflow Warning</h4>
                     <p>The soakwell overflows {total_overflow:.1f} m³ during this storm event. 
                     Consider increasing the diameter or depth, or use multiple soakwells.</p>
                 </div>
             """
-    
-    # French Drain Analysis  
-    if french_drain_results:
-        pipe_diameter = 0.30  # m
-        trench_width = 0.60  # m
-        trench_depth = 0.90  # m
-        length = config.get('french_drain_length', 100.0)
-        soil_k = 4.63e-5  # m/s
-        
-        # Performance metrics
-        max_storage = french_drain_results['performance']['max_trench_storage_m3']
-        max_water_level = french_drain_results['performance']['max_water_level_m']
-        total_infiltrated = french_drain_results['performance']['total_infiltrated_m3']
-        total_overflow = french_drain_results['performance']['total_overflow_m3']
-        pipe_capacity = french_drain_results['performance'].get('pipe_capacity_m3s', 0.08)
-        
-        html_report += f"""
+
+_FRENCH_DRAIN_SECTION_TMPL = """
             <div class="section-header">3. FRENCH DRAIN ANALYSIS</div>
             
             <div class="calculation-box">
                 <h4>3.1 System Geometry</h4>
                 <table class="parameter-table">
                     <tr><th>Component</th><th>Dimension</th><th>Unit</th></tr>
-                    <tr><td>Pipe Diameter</td><td>{pipe_diameter*1000:.0f}</td><td>mm</td></tr>
-                    <tr><td>Trench Width</td><td>{trench_width*1000:.0f}</td><td>mm</td></tr>
-                    <tr><td>Trench Depth</td><td>{trench_depth*1000:.0f}</td><td>mm</td></tr>
-                    <tr><td>System Length</td><td>{length:.0f}</td><td>m</td></tr>
-                    <tr><td>Soil Permeability</td><td>{soil_k:.1e}</td><td>m/s</td></tr>
+                    {geometry_rows}
                 </table>
             </div>
             
@@ -230,23 +197,23 @@ def generate_calculation_report(soakwell_results, french_drain_results, storm_na
                 <p><strong>Pipe Flow Capacity (Manning's Equation):</strong></p>
                 <p>Q = (1/n) × A × R^(2/3) × S^(1/2)</p>
                 <ul>
-                    <li>Pipe area = π × ({pipe_diameter:.2f}/2)² = {np.pi*(pipe_diameter/2)**2:.4f} m²</li>
+                    <li>Pipe area = π × ({pipe_diameter:.2f}/2)² = {pipe_area:.4f} m²</li>
                     <li>Manning's n = 0.013 (concrete pipe)</li>
                     <li>Slope = 0.005 (0.5%)</li>
-                    <li>Pipe capacity ≈ {pipe_capacity*1000:.0f} L/s</li>
+                    <li>Pipe capacity ≈ {pipe_capacity_ls:.0f} L/s</li>
                 </ul>
                 
                 <p><strong>Trench Storage Capacity:</strong></p>
                 <ul>
-                    <li>Trench volume = {trench_width:.1f} × {trench_depth:.1f} × {length:.0f} = {trench_width*trench_depth*length:.0f} m³</li>
+                    <li>Trench volume = {trench_width:.1f} × {trench_depth:.1f} × {length:.0f} = {trench_volume:.0f} m³</li>
                     <li>Aggregate porosity = 35%</li>
-                    <li>Effective storage = {trench_width*trench_depth*length*0.35:.0f} m³</li>
+                    <li>Effective storage = {effective_storage:.0f} m³</li>
                 </ul>
                 
                 <p><strong>Infiltration Rate (Darcy's Law):</strong></p>
                 <ul>
-                    <li>Base area = {trench_width:.1f} × {length:.0f} = {trench_width*length:.0f} m²</li>
-                    <li>Max infiltration ≈ {soil_k:.1e} × {trench_width*length:.0f} = {soil_k*trench_width*length*1000:.1f} L/s</li>
+                    <li>Base area = {trench_width:.1f} × {length:.0f} = {base_area:.0f} m²</li>
+                    <li>Max infiltration ≈ {soil_k:.1e} × {base_area:.0f} = {max_infiltration_ls:.1f} L/s</li>
                 </ul>
             </div>
             
@@ -254,57 +221,35 @@ def generate_calculation_report(soakwell_results, french_drain_results, storm_na
                 <h4>3.3 French Drain Performance Results</h4>
                 <table class="parameter-table">
                     <tr><th>Performance Metric</th><th>Value</th><th>Unit</th></tr>
-                    <tr><td>Maximum Storage Used</td><td>{max_storage:.1f}</td><td>m³</td></tr>
-                    <tr><td>Maximum Water Level</td><td>{max_water_level*1000:.0f}</td><td>mm</td></tr>
-                    <tr><td>Peak Pipe Utilization</td><td>{max(french_drain_results['pipe_flow'])/pipe_capacity*100:.1f}</td><td>%</td></tr>
-                    <tr><td>Total Infiltrated</td><td>{total_infiltrated:.1f}</td><td>m³</td></tr>
-                    <tr><td>Total Overflow</td><td>{total_overflow:.1f}</td><td>m³</td></tr>
-                    <tr><td>Infiltration Efficiency</td><td>{french_drain_results['performance']['infiltration_efficiency_percent']:.1f}</td><td>%</td></tr>
-                    <tr><td>Mass Balance Error</td><td>{french_drain_results['performance']['mass_balance_error_percent']:.2f}</td><td>%</td></tr>
+                    {french_drain_rows}
                 </table>
             </div>
         """
-        
-        if total_overflow > 0.1:
-            html_report += f"""
+
+_FRENCH_DRAIN_OVERFLOW_TMPL = """
                 <div class="warning-box">
                     <h4>⚠️ French Drain Overflow Warning</h4>
                     <p>The French drain system overflows {total_overflow:.1f} m³ during this storm event. 
                     Consider increasing the length, trench size, or pipe capacity.</p>
                 </div>
             """
-    
-    # Comparison section
-    if soakwell_results and french_drain_results:
-        sw_efficiency = ((total_volume - soakwell_results['mass_balance']['total_overflow_m3']) / total_volume * 100)
-        fd_efficiency = french_drain_results['performance']['infiltration_efficiency_percent']
-        
-        html_report += f"""
+
+_COMPARISON_SECTION_TMPL = """
             <div class="section-header">4. COMPARATIVE ANALYSIS</div>
             
             <div class="calculation-box">
                 <h4>4.1 Performance Comparison</h4>
                 <table class="parameter-table">
                     <tr><th>Metric</th><th>Soakwell</th><th>French Drain</th><th>Better Option</th></tr>
-                    <tr><td>Infiltration Efficiency</td><td>{sw_efficiency:.1f}%</td><td>{fd_efficiency:.1f}%</td><td>{'Soakwell' if sw_efficiency > fd_efficiency else 'French Drain'}</td></tr>
-                    <tr><td>Total Overflow</td><td>{soakwell_results['mass_balance']['total_overflow_m3']:.1f} m³</td><td>{total_overflow:.1f} m³</td><td>{'Soakwell' if soakwell_results['mass_balance']['total_overflow_m3'] < total_overflow else 'French Drain'}</td></tr>
-                    <tr><td>Max Storage Used</td><td>{max(soakwell_results['stored_volume']):.1f} m³</td><td>{max_storage:.1f} m³</td><td>{'Soakwell' if max(soakwell_results['stored_volume']) < max_storage else 'French Drain'}</td></tr>
-                    <tr><td>Mass Balance Error</td><td>{soakwell_results['mass_balance']['mass_balance_error_percent']:.2f}%</td><td>{french_drain_results['performance']['mass_balance_error_percent']:.2f}%</td><td>{'Soakwell' if abs(soakwell_results['mass_balance']['mass_balance_error_percent']) < abs(french_drain_results['performance']['mass_balance_error_percent']) else 'French Drain'}</td></tr>
+                    {comparison_rows}
                 </table>
             </div>
             
             <div class="result-box">
                 <h4>4.2 Engineering Recommendations</h4>
         """
-        
-        if sw_efficiency > fd_efficiency and soakwell_results['mass_balance']['total_overflow_m3'] < total_overflow:
-            html_report += "<p><strong>Recommendation:</strong> Soakwell system provides better overall performance for this storm event.</p>"
-        elif fd_efficiency > sw_efficiency and total_overflow < soakwell_results['mass_balance']['total_overflow_m3']:
-            html_report += "<p><strong>Recommendation:</strong> French drain system provides better overall performance for this storm event.</p>"
-        else:
-            html_report += "<p><strong>Recommendation:</strong> Both systems show similar performance. Consider other factors like cost, maintenance, and site constraints.</p>"
-            
-        html_report += """
+
+_CONSIDERATIONS = """
                 <p><strong>Additional Considerations:</strong></p>
                 <ul>
                     <li>Soakwells require less linear space but more depth</li>
@@ -314,57 +259,272 @@ def generate_calculation_report(soakwell_results, french_drain_results, storm_na
                 </ul>
             </div>
         """
+
+_NO_RESULTS_BODY = """
+        <div class="warning-box">
+            <h4>⚠️ No Results</h4>
+            <p>No soakwell or French drain results were available for this storm event.</p>
+        </div>
+    """ + _TECHNICAL_NOTES_HEAD + _REPORT_FOOTER
+
+_MASS_BALANCE_NOTE_TMPL = "<li>{system} mass balance error: {error:.2f}% - {status}</li>"
+
+# Parameter table rows of three and four cells
+_ROW3 = '<tr><td>{}</td><td>{}</td><td>{}</td></tr>'
+_ROW4 = '<tr><td>{}</td><td>{}</td><td>{}</td><td>{}</td></tr>'
+
+def generate_calculation_report(soakwell_results, french_drain_results, storm_name, config,
+                                include_css=True):
+    """
+    Generate a comprehensive engineering calculation report
     
-    html_report += f"""
-        <div class="section-header">5. TECHNICAL NOTES</div>
-        <div class="calculation-box">
-            <h4>5.1 Mass Balance Verification</h4>
-            <p>Mass balance errors should be close to 0% for accurate simulations:</p>
-            <ul>
+    Parameters:
+    soakwell_results: Results from soakwell simulation
+    french_drain_results: Results from French drain simulation  
+    storm_name: Name of the analyzed storm
+    config: Configuration parameters used
+    include_css: Prefix the report stylesheet; pass False when the page already
+                 carries it (see inject_report_css)
+    
+    Returns:
+    str: HTML report content
     """
     
+    # Report header
+    report_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    
+    header = _REPORT_HEADER_TMPL.format_map({'storm_name': storm_name, 'report_date': report_date})
+    if include_css:
+        header = _REPORT_CSS + header
+    
+    # Storm characteristics
     if soakwell_results:
-        mb_error = soakwell_results['mass_balance']['mass_balance_error_percent']
-        status = "✅ Acceptable" if abs(mb_error) < 1.0 else "⚠️ Review Required"
-        html_report += f"<li>Soakwell mass balance error: {mb_error:.2f}% - {status}</li>"
+        total_volume = soakwell_results['mass_balance']['total_inflow_m3']
+        peak_inflow = np.asarray(soakwell_results['inflow_rate'], dtype=np.float64).max()
+        duration_hours = np.asarray(soakwell_results['time_min'], dtype=np.float64).max() / 60
+    elif french_drain_results:
+        total_volume = french_drain_results['performance']['total_inflow_m3']
+        peak_inflow = np.asarray(french_drain_results['inflow'], dtype=np.float64).max()
+        duration_hours = np.asarray(french_drain_results['time'], dtype=np.float64).max() / 3600
+    else:
+        # Nothing was simulated, so there are no figures to report
+        return header + _NO_RESULTS_BODY
+    
+    soakwell = _soakwell_figures(soakwell_results, config) if soakwell_results else None
+    french_drain = _french_drain_figures(french_drain_results, config) if french_drain_results else None
+    
+    figures = (total_volume, peak_inflow, duration_hours, soakwell, french_drain)
+    render_body = _render_report_body
+    try:
+        hash(figures)
+    except TypeError:
+        # Unhashable figures (e.g. odd config values) are rendered uncached
+        render_body = _render_report_body.__wrapped__
+    
+    return header + render_body(*figures)
+
+def inject_report_css():
+    """Add the report stylesheet to the page, once per render however many reports follow"""
+    import streamlit as st
+    st.markdown(_REPORT_CSS, unsafe_allow_html=True)
+
+def with_report_css(report_html):
+    """Standalone HTML (e.g. for download) of a report generated with include_css=False"""
+    return _REPORT_CSS + report_html
+
+def _soakwell_figures(soakwell_results, config):
+    """
+    Soakwell figures for the report: diameter m, ks m/s, max volume m³,
+    max stored m³, max level m, max outflow m³/s, total overflow m³ and
+    mass balance error %
+    """
+    return (config.get('soakwell_diameter', 2.0),
+            config.get('ks', 1e-5),
+            soakwell_results['max_volume'],
+            np.asarray(soakwell_results['stored_volume'], dtype=np.float64).max(),
+            np.asarray(soakwell_results['water_level'], dtype=np.float64).max(),
+            np.asarray(soakwell_results['outflow_rate'], dtype=np.float64).max(),
+            soakwell_results['mass_balance']['total_overflow_m3'],
+            soakwell_results['mass_balance']['mass_balance_error_percent'])
+
+def _french_drain_figures(french_drain_results, config):
+    """
+    French drain figures for the report: length m, max trench storage m³,
+    max water level m, total infiltrated m³, total overflow m³, pipe capacity
+    m³/s, peak pipe flow m³/s, infiltration efficiency % and mass balance error %
+    """
+    performance = french_drain_results['performance']
+    return (config.get('french_drain_length', 100.0),
+            performance['max_trench_storage_m3'],
+            performance['max_water_level_m'],
+            performance['total_infiltrated_m3'],
+            performance['total_overflow_m3'],
+            performance.get('pipe_capacity_m3s', 0.08),
+            np.asarray(french_drain_results['pipe_flow'], dtype=np.float64).max(),
+            performance['infiltration_efficiency_percent'],
+            performance['mass_balance_error_percent'])
+
+def _rows(template, rows, indent):
+    """Table rows from a row template, one per line at the given indent"""
+    return ('\n' + ' ' * indent).join(template.format(*row) for row in rows)
+
+def _pick(a, b, label_a='Soakwell', label_b='French Drain'):
+    """label_a if a is greater than b, otherwise label_b"""
+    return label_a if a > b else label_b
+
+@lru_cache(maxsize=32, typed=True)
+def _render_report_body(total_volume, peak_inflow, duration_hours, soakwell, french_drain):
+    """
+    Report sections 1 to 5 and the footer, below the dated header
+    
+    Rendered from the extracted figures only, so Streamlit re-runs that show
+    the same storm and configuration reuse the HTML. soakwell and
+    french_drain are the figure tuples of each system, or None to omit it.
+    """
+    
+    storm_rows = [
+        ('Storm Duration', f"{duration_hours:.1f}", 'hours'),
+        ('Peak Inflow Rate', f"{peak_inflow*1000:.1f}", 'L/s'),
+        ('Total Runoff Volume', f"{total_volume:.1f}", 'm³'),
+        ('Average Intensity', f"{total_volume/(duration_hours*3600)*1000:.1f}", 'L/s'),
+    ]
+    
+    # Report sections are collected in order and joined once at the end
+    parts = [_STORM_SECTION_TMPL.format_map({'storm_rows': _rows(_ROW3, storm_rows, 16)})]
+    
+    # Soakwell Analysis
+    if soakwell:
+        (diameter, ks, max_volume, max_stored, max_level, max_outflow,
+         total_overflow, sw_mb_error) = soakwell
+        
+        # Soakwell geometry calculations
+        radius = diameter / 2
+        area = _PI * radius**2
+        max_height = max_volume / area
         
-    if french_drain_results:
-        mb_error = french_drain_results['performance']['mass_balance_error_percent']
-        status = "✅ Acceptable" if abs(mb_error) < 1.0 else "⚠️ Review Required"
-        html_report += f"<li>French drain mass balance error: {mb_error:.2f}% - {status}</li>"
+        # Performance metrics
+        infiltration_efficiency = ((total_volume - total_overflow) / total_volume * 100) if total_volume > 0 else 0
+        
+        soakwell_rows = [
+            ('Maximum Storage Used', f"{max_stored:.1f}", 'm³'),
+            ('Maximum Water Level', f"{max_level:.2f}", 'm'),
+            ('Storage Utilization', f"{max_stored/max_volume*100:.1f}", '%'),
+            ('Total Overflow', f"{total_overflow:.1f}", 'm³'),
+            ('Infiltration Efficiency', f"{infiltration_efficiency:.1f}", '%'),
+            ('Mass Balance Error', f"{sw_mb_error:.2f}", '%'),
+        ]
+        
+        parts.append(_SOAKWELL_SECTION_TMPL.format_map({
+            'diameter': diameter, 'ks': ks, 'radius': radius, 'area': area,
+            'max_height': max_height, 'max_volume': max_volume,
+            'max_outflow_ls': max_outflow*1000,
+            'soakwell_rows': _rows(_ROW3, soakwell_rows, 20),
+        }))
+        
+        if total_overflow > 0.1:
+            parts.append(_SOAKWELL_OVERFLOW_TMPL.format_map({'total_overflow': total_overflow}))
     
-    html_report += f"""
-            </ul>
-            
-            <h4>5.2 Model Assumptions</h4>
-            <ul>
-                <li>Soil permeability is uniform and constant</li>
-                <li>Water table is deep (no groundwater interference)</li>
-                <li>No clogging or reduction in permeability over time</li>
-                <li>Steady-state infiltration rates</li>
-                <li>Perfect hydraulic connections</li>
-            </ul>
+    # French Drain Analysis  
+    if french_drain:
+        pipe_diameter = 0.30  # m
+        trench_width = 0.60  # m
+        trench_depth = 0.90  # m
+        soil_k = 4.63e-5  # m/s
+        
+        # Performance metrics
+        (length, max_storage, max_water_level, total_infiltrated, total_overflow,
+         pipe_capacity, peak_pipe_flow, fd_efficiency, fd_mb_error) = french_drain
+        
+        # Capacity figures for section 3.2
+        pipe_area = _PI * (pipe_diameter * 0.5)**2
+        trench_volume = trench_width * trench_depth * length
+        effective_storage = trench_volume * 0.35
+        base_area = trench_width * length
+        max_infiltration_ls = soil_k * trench_width * length * 1000
+        
+        geometry_rows = [
+            ('Pipe Diameter', f"{pipe_diameter*1000:.0f}", 'mm'),
+            ('Trench Width', f"{trench_width*1000:.0f}", 'mm'),
+            ('Trench Depth', f"{trench_depth*1000:.0f}", 'mm'),
+            ('System Length', f"{length:.0f}", 'm'),
+            ('Soil Permeability', f"{soil_k:.1e}", 'm/s'),
+        ]
+        french_drain_rows = [
+            ('Maximum Storage Used', f"{max_storage:.1f}", 'm³'),
+            ('Maximum Water Level', f"{max_water_level*1000:.0f}", 'mm'),
+            ('Peak Pipe Utilization', f"{peak_pipe_flow/pipe_capacity*100:.1f}", '%'),
+            ('Total Infiltrated', f"{total_infiltrated:.1f}", 'm³'),
+            ('Total Overflow', f"{total_overflow:.1f}", 'm³'),
+            ('Infiltration Efficiency', f"{fd_efficiency:.1f}", '%'),
+            ('Mass Balance Error', f"{fd_mb_error:.2f}", '%'),
+        ]
+        
+        parts.append(_FRENCH_DRAIN_SECTION_TMPL.format_map({
+            'pipe_diameter': pipe_diameter, 'pipe_area': pipe_area,
+            'pipe_capacity_ls': pipe_capacity*1000,
+            'trench_width': trench_width, 'trench_depth': trench_depth, 'length': length,
+            'trench_volume': trench_volume, 'effective_storage': effective_storage,
+            'soil_k': soil_k, 'base_area': base_area, 'max_infiltration_ls': max_infiltration_ls,
+            'geometry_rows': _rows(_ROW3, geometry_rows, 20),
+            'french_drain_rows': _rows(_ROW3, french_drain_rows, 20),
+        }))
+        
+        if total_overflow > 0.1:
+            parts.append(_FRENCH_DRAIN_OVERFLOW_TMPL.format_map({'total_overflow': total_overflow}))
+    
+    # Comparison section
+    if soakwell and french_drain:
+        # total_overflow is the French drain's here
+        sw_overflow = soakwell[6]
+        fd_overflow = total_overflow
+        sw_efficiency = ((total_volume - sw_overflow) / total_volume * 100)
+        sw_more_efficient = sw_efficiency > fd_efficiency
+        sw_less_overflow = sw_overflow < fd_overflow
+        
+        # Better option per metric (higher efficiency; lower overflow, storage and error)
+        better = {
+            'efficiency': _pick(sw_efficiency, fd_efficiency),
+            'overflow': _pick(-sw_overflow, -fd_overflow),
+            'storage': _pick(-max_stored, -max_storage),
+            'mass_balance': _pick(-abs(sw_mb_error), -abs(fd_mb_error)),
+        }
+        
+        comparison_rows = [
+            ('Infiltration Efficiency', f"{sw_efficiency:.1f}%", f"{fd_efficiency:.1f}%", better['efficiency']),
+            ('Total Overflow', f"{sw_overflow:.1f} m³", f"{fd_overflow:.1f} m³", better['overflow']),
+            ('Max Storage Used', f"{max_stored:.1f} m³", f"{max_storage:.1f} m³", better['storage']),
+            ('Mass Balance Error', f"{sw_mb_error:.2f}%", f"{fd_mb_error:.2f}%", better['mass_balance']),
+        ]
+        
+        parts.append(_COMPARISON_SECTION_TMPL.format_map({'comparison_rows': _rows(_ROW4, comparison_rows, 20)}))
+        
+        if sw_more_efficient and sw_less_overflow:
+            parts.append("<p><strong>Recommendation:</strong> Soakwell system provides better overall performance for this storm event.</p>")
+        elif fd_efficiency > sw_efficiency and fd_overflow < sw_overflow:
+            parts.append("<p><strong>Recommendation:</strong> French drain system provides better overall performance for this storm event.</p>")
+        else:
+            parts.append("<p><strong>Recommendation:</strong> Both systems show similar performance. Consider other factors like cost, maintenance, and site constraints.</p>")
             
-            <h4>5.3 Design Standards</h4>
-            <ul>
-                <li>Australian Standard AS/NZS 3500.3 for drainage systems</li>
-                <li>Local council requirements for stormwater management</li>
-                <li>Factor of safety should be applied to final design</li>
-            </ul>
-        </div>
+        parts.append(_CONSIDERATIONS)
+    
+    parts.append(_TECHNICAL_NOTES_HEAD)
+    
+    if soakwell:
+        status = "✅ Acceptable" if abs(sw_mb_error) < 1.0 else "⚠️ Review Required"
+        parts.append(_MASS_BALANCE_NOTE_TMPL.format_map({'system': 'Soakwell', 'error': sw_mb_error, 'status': status}))
         
-        <div class="section-header">Report Generated by Soakwell Analysis Tool</div>
-        <p style="text-align: center; color: #666; font-size: 0.9em;">
-            This report is for preliminary design purposes only. 
-            Detailed site investigation and professional engineering review required for final design.
-        </p>
-    </div>
-    """
+    if french_drain:
+        status = "✅ Acceptable" if abs(fd_mb_error) < 1.0 else "⚠️ Review Required"
+        parts.append(_MASS_BALANCE_NOTE_TMPL.format_map({'system': 'French drain', 'error': fd_mb_error, 'status': status}))
+    
+    parts.append(_REPORT_FOOTER)
     
-    return html_report
+    return "".join(parts)
 
 def add_report_button_to_sidebar():
     """Add report generation button to sidebar"""
+    import streamlit as st
+    
     st.sidebar.markdown("---")
     st.sidebar.subheader("📊 Engineering Report")
     
@@ -373,8 +533,27 @@ def add_report_button_to_sidebar():
     else:
         return False
 
+def _mass_balance_table(components, volumes, error_percent):
+    """
+    Mass balance summary table; volumes run from the total inflow to the
+    balance error, and each is given as a percentage of the inflow
+    """
+    import pandas as pd
+    
+    volumes = np.array(volumes, dtype=np.float64)
+    percentages = volumes / volumes[0] * 100
+    percentages[0] = 100.0
+    percentages[-1] = error_percent
+    return pd.DataFrame({
+        'Component': components,
+        'Volume (m³)': volumes,
+        'Percentage': percentages
+    })
+
 def display_mass_balance_summary(soakwell_results=None, french_drain_results=None):
     """Display mass balance summary in the main interface"""
+    import streamlit as st
+    
     st.subheader("🔍 Mass Balance Verification")
     
     col1, col2 = st.columns(2)
@@ -384,23 +563,11 @@ def display_mass_balance_summary(soakwell_results=None, french_drain_results=Non
             st.markdown("**Soakwell Mass Balance**")
             mb = soakwell_results['mass_balance']
             
-            df_sw = pd.DataFrame({
-                'Component': ['Total Inflow', 'Total Outflow', 'Total Overflow', 'Final Stored', 'Balance Error'],
-                'Volume (m³)': [
-                    mb['total_inflow_m3'],
-                    mb['total_outflow_m3'], 
-                    mb['total_overflow_m3'],
-                    mb['final_stored_m3'],
-                    mb['mass_balance_error_m3']
-                ],
-                'Percentage': [
-                    100.0,
-                    mb['total_outflow_m3']/mb['total_inflow_m3']*100,
-                    mb['total_overflow_m3']/mb['total_inflow_m3']*100,
-                    mb['final_stored_m3']/mb['total_inflow_m3']*100,
-                    mb['mass_balance_error_percent']
-                ]
-            })
+            df_sw = _mass_balance_table(
+                ['Total Inflow', 'Total Outflow', 'Total Overflow', 'Final Stored', 'Balance Error'],
+                [mb['total_inflow_m3'], mb['total_outflow_m3'], mb['total_overflow_m3'],
+                 mb['final_stored_m3'], mb['mass_balance_error_m3']],
+                mb['mass_balance_error_percent'])
             
             st.dataframe(df_sw, use_container_width=True)
             
@@ -414,23 +581,11 @@ def display_mass_balance_summary(soakwell_results=None, french_drain_results=Non
             st.markdown("**French Drain Mass Balance**")
             perf = french_drain_results['performance']
             
-            df_fd = pd.DataFrame({
-                'Component': ['Total Inflow', 'Total Infiltrated', 'Total Overflow', 'Final Stored', 'Balance Error'],
-                'Volume (m³)': [
-                    perf['total_inflow_m3'],
-                    perf['total_infiltrated_m3'],
-                    perf['total_overflow_m3'], 
-                    perf['final_stored_m3'],
-                    perf['mass_balance_error_m3']
-                ],
-                'Percentage': [
-                    100.0,
-                    perf['total_infiltrated_m3']/perf['total_inflow_m3']*100,
-                    perf['total_overflow_m3']/perf['total_inflow_m3']*100,
-                    perf['final_stored_m3']/perf['total_inflow_m3']*100,
-                    perf['mass_balance_error_percent']
-                ]
-            })
+            df_fd = _mass_balance_table(
+                ['Total Inflow', 'Total Infiltrated', 'Total Overflow', 'Final Stored', 'Balance Error'],
+                [perf['total_inflow_m3'], perf['total_infiltrated_m3'], perf['total_overflow_m3'],
+                 perf['final_stored_m3'], perf['mass_balance_error_m3']],
+                perf['mass_balance_error_percent'])
             
             st.dataframe(df_fd, use_container_width=True)
             
@@ -6,10 +6,13 @@ Easy-to-use launcher for generating infiltration system analysis reports
 
 import os
 import sys
-import subprocess
+import argparse
+import importlib.util
+from functools import lru_cache
 
-def check_dependencies():
-    """Check if required Python modules are available"""
+@lru_cache(maxsize=1)
+def _find_missing_modules():
+    """Required and optional modules that are not installed (looked up once per session)"""
     required_modules = [
         'numpy', 'pandas'
     ]
@@ -18,20 +21,17 @@ def check_dependencies():
         'plotly', 'streamlit'  # These are optional for standalone reports
     ]
     
-    missing_modules = []
-    missing_optional = []
-    
-    for module in required_modules:
-        try:
-            __import__(module)
-        except ImportError:
-            missing_modules.append(module)
+    # find_spec only locates each module; nothing is imported
+    missing_modules = [module for module in required_modules
+                       if importlib.util.find_spec(module) is None]
+    missing_optional = [module for module in optional_modules
+                        if importlib.util.find_spec(module) is None]
     
-    for module in optional_modules:
-        try:
-            __import__(module)
-        except ImportError:
-            missing_optional.append(module)
+    return tuple(missing_modules), tuple(missing_optional)
+
+def check_dependencies():
+    """Check if required Python modules are available"""
+    missing_modules, missing_optional = _find_missing_modules()
     
     if missing_modules:
         print(f"❌ Missing required modules: {', '.join(missing_modules)}")
@@ -47,6 +47,19 @@ def check_dependencies():
     
     return True
 
+@lru_cache(maxsize=4)
+def _list_dir(path, mtime_ns):
+    """Entry names in path; keyed on the directory's mtime so a changed folder is re-listed"""
+    with os.scandir(path) as entries:
+        return frozenset(entry.name for entry in entries)
+
+def _dir_names(path):
+    """Entry names in path (None if it is not a directory), listed only when it changes"""
+    try:
+        return _list_dir(os.path.abspath(path), os.stat(path).st_mtime_ns)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
 def check_files():
     """Check if required files are present"""
     required_files = [
@@ -56,10 +69,8 @@ def check_files():
         'batch_report_generator.py'
     ]
     
-    missing_files = []
-    for file in required_files:
-        if not os.path.exists(file):
-            missing_files.append(file)
+    cwd_names = _dir_names('.')
+    missing_files = [file for file in required_files if file not in cwd_names]
     
     if missing_files:
         print(f"❌ Missing required files: {', '.join(missing_files)}")
@@ -70,12 +81,13 @@ def check_files():
 def check_storm_data():
     """Check if storm data is available"""
     drains_dir = "DRAINS"
-    if not os.path.exists(drains_dir):
+    drains_names = _dir_names(drains_dir)
+    if drains_names is None:
         print(f"❌ DRAINS directory not found")
         print(f"💡 Please ensure the DRAINS folder with .ts1 files is present")
         return False
     
-    ts1_files = [f for f in os.listdir(drains_dir) if f.endswith('.ts1')]
+    ts1_files = [f for f in drains_names if f.endswith('.ts1')]
     if not ts1_files:
         print(f"❌ No .ts1 storm files found in DRAINS directory")
         return False
@@ -147,11 +159,25 @@ def check_system_status():
         print("❌ System not ready - please resolve the issues above")
         return False
 
-def main():
-    """Main launcher function"""
-    print("🚀 Engineering Report System Launcher")
-    print("North Fremantle Pedestrian Infrastructure Project")
+def run_mode(mode):
+    """Run one launcher action ('interactive', 'batch' or 'status')"""
+    # The module lookups and directory listings behind the check are cached,
+    # so running it before every action is cheap
+    if mode == 'status':
+        return check_system_status()
+    
+    if not check_system_status():
+        print("\n⚠️  Please resolve system issues before proceeding")
+        return False
     
+    if mode == 'interactive':
+        run_interactive_generator()
+    else:
+        run_batch_generator()
+    return True
+
+def run_menu():
+    """Interactive menu, used when the launcher is started without arguments"""
     while True:
         show_menu()
         
@@ -159,19 +185,13 @@ def main():
             choice = input("Select option (1-4): ").strip()
             
             if choice == '1':
-                if check_system_status():
-                    run_interactive_generator()
-                else:
-                    print("\n⚠️  Please resolve system issues before proceeding")
+                run_mode('interactive')
             
             elif choice == '2':
-                if check_system_status():
-                    run_batch_generator()
-                else:
-                    print("\n⚠️  Please resolve system issues before proceeding")
+                run_mode('batch')
             
             elif choice == '3':
-                check_system_status()
+                run_mode('status')
             
             elif choice == '4':
                 print("\n👋 Goodbye!")
@@ -186,6 +206,21 @@ def main():
         except Exception as e:
             print(f"\n❌ Unexpected error: {e}")
 
+def main(argv=None):
+    """Main launcher function"""
+    parser = argparse.ArgumentParser(description="Engineering report system launcher")
+    parser.add_argument('mode', nargs='?', choices=['interactive', 'batch', 'status'],
+                        help="action to run; omit for the interactive menu")
+    args = parser.parse_args(argv)
+    
+    print("🚀 Engineering Report System Launcher")
+    print("North Fremantle Pedestrian Infrastructure Project")
+    
+    if args.mode is None:
+        run_menu()
+    else:
+        run_mode(args.mode)
+
 if __name__ == "__main__":
     try:
         main()
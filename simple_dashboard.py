@@ -5,29 +5,14 @@ Alternative to Streamlit using basic HTML/Python server
 """
 
 import http.server
-import socketserver
+import socket
 import json
 import urllib.parse
 import math
 import os
+import gzip
 
-class SoakwellHandler(http.server.SimpleHTTPRequestHandler):
-    def do_GET(self):
-        if self.path == '/' or self.path == '/index.html':
-            self.send_dashboard_html()
-        elif self.path.startswith('/api/analyze'):
-            self.handle_analysis()
-        else:
-            super().do_GET()
-    
-    def do_POST(self):
-        if self.path == '/api/upload':
-            self.handle_file_upload()
-        else:
-            self.send_error(404)
-    
-    def send_dashboard_html(self):
-        html_content = """
+_DASHBOARD_HTML = """
 <!DOCTYPE html>
 <html>
 <head>
@@ -118,10 +103,10 @@ class SoakwellHandler(http.server.SimpleHTTPRequestHandler):
     </div>
 
     <script>
-        // Sample data for demonstration
+        // Sample data for demonstration (typed arrays keep the simulation loop on unboxed doubles)
         const demoData = {
-            time_min: [0, 10, 20, 30, 40, 50, 60, 70, 80, 90, 100, 110, 120],
-            total_flow: [0, 0.001, 0.004, 0.008, 0.012, 0.015, 0.010, 0.006, 0.003, 0.001, 0, 0, 0]
+            time_min: new Float64Array([0, 10, 20, 30, 40, 50, 60, 70, 80, 90, 100, 110, 120]),
+            total_flow: new Float64Array([0, 0.001, 0.004, 0.008, 0.012, 0.015, 0.010, 0.006, 0.003, 0.001, 0, 0, 0])
         };
         
         function updateSoilProperties() {
@@ -152,8 +137,14 @@ class SoakwellHandler(http.server.SimpleHTTPRequestHandler):
         function simulatePerformance(hydrographData, diameter, ks, Sr, maxHeight) {
             if (!maxHeight) maxHeight = diameter;
             
-            const maxVolume = Math.PI * Math.pow(diameter/2, 2) * maxHeight;
+            const radius = diameter * 0.5;
+            const baseArea = Math.PI * radius * radius;
+            const maxVolume = baseArea * maxHeight;
             const maxOutflowRate = calculateSoakwellOutflow(diameter, ks, Sr);
+            const invBaseArea = 1.0 / baseArea;
+            const invMaxHeight = 1.0 / maxHeight;
+            const t = hydrographData.time_min;
+            const q = hydrographData.total_flow;
             
             let storedVolume = 0;
             let cumulativeInflow = 0;
@@ -161,13 +152,13 @@ class SoakwellHandler(http.server.SimpleHTTPRequestHandler):
             let maxStorage = 0;
             let peakOverflow = 0;
             
-            for (let i = 1; i < hydrographData.time_min.length; i++) {
-                const dt = (hydrographData.time_min[i] - hydrographData.time_min[i-1]) * 60; // seconds
-                const inflow = hydrographData.total_flow[i];
+            for (let i = 1; i < t.length; i++) {
+                const dt = (t[i] - t[i-1]) * 60; // seconds
+                const inflow = q[i];
                 
                 // Calculate outflow based on current water level
-                const currentLevel = storedVolume / (Math.PI * Math.pow(diameter/2, 2));
-                const levelFactor = Math.min(currentLevel / maxHeight, 1.0);
+                const levelRatio = storedVolume * invBaseArea * invMaxHeight;
+                const levelFactor = levelRatio > 1 ? 1 : levelRatio;
                 const currentOutflowRate = storedVolume > 0 ? maxOutflowRate * levelFactor : 0;
                 
                 // Volume changes
@@ -266,11 +257,53 @@ class SoakwellHandler(http.server.SimpleHTTPRequestHandler):
 </body>
 </html>
         """
+
+# The page never changes, so it is encoded and compressed once at import
+_DASHBOARD_HTML_BYTES = _DASHBOARD_HTML.encode('utf-8')
+_DASHBOARD_HTML_GZ = gzip.compress(_DASHBOARD_HTML_BYTES, 9)
+_DASHBOARD_HTML_LEN = str(len(_DASHBOARD_HTML_BYTES))
+_DASHBOARD_HTML_GZ_LEN = str(len(_DASHBOARD_HTML_GZ))
+
+class SoakwellHandler(http.server.SimpleHTTPRequestHandler):
+    # Every response carries a Content-Length, so browsers can keep the connection open
+    protocol_version = "HTTP/1.1"
+    
+    def setup(self):
+        super().setup()
+        # The responses are small; send them straight away rather than waiting on Nagle
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    
+    def log_request(self, code='-', size='-'):
+        # No access line per request; errors still go through log_error
+        pass
+    
+    def do_GET(self):
+        if self.path == '/' or self.path == '/index.html':
+            self.send_dashboard_html()
+        elif self.path.startswith('/api/analyze'):
+            self.handle_analysis()
+        else:
+            super().do_GET()
+    
+    def do_POST(self):
+        if self.path == '/api/upload':
+            self.handle_file_upload()
+        else:
+            self.send_error(404)
+    
+    def send_dashboard_html(self):
+        gzipped = 'gzip' in self.headers.get('Accept-Encoding', '')
         
         self.send_response(200)
         self.send_header('Content-type', 'text/html')
+        if gzipped:
+            self.send_header('Content-Encoding', 'gzip')
+            self.send_header('Content-Length', _DASHBOARD_HTML_GZ_LEN)
+        else:
+            self.send_header('Content-Length', _DASHBOARD_HTML_LEN)
+        self.send_header('Vary', 'Accept-Encoding')
         self.end_headers()
-        self.wfile.write(html_content.encode())
+        self.wfile.write(_DASHBOARD_HTML_GZ if gzipped else _DASHBOARD_HTML_BYTES)
 
 def start_server():
     PORT = 8505
@@ -280,7 +313,8 @@ def start_server():
     print("🛑 Press Ctrl+C to stop")
     print("-" * 60)
     
-    with socketserver.TCPServer(("", PORT), SoakwellHandler) as httpd:
+    # ThreadingHTTPServer handles each connection in its own thread and reuses the address
+    with http.server.ThreadingHTTPServer(("", PORT), SoakwellHandler) as httpd:
         try:
             httpd.serve_forever()
         except KeyboardInterrupt:
@@ -21,7 +21,7 @@ import datetime
 FRENCH_DRAIN_AVAILABLE = False
 try:
     from french_drain_integration import integrate_french_drain_analysis, add_french_drain_sidebar
-    from report_generator import generate_calculation_report, display_mass_balance_summary
+    from report_generator import generate_calculation_report, display_mass_balance_summary, inject_report_css, with_report_css
     from comprehensive_report_generator import generate_comprehensive_engineering_report, add_comprehensive_report_to_sidebar
     FRENCH_DRAIN_AVAILABLE = True
 except ImportError as e:
@@ -134,29 +134,27 @@ def read_hydrograph_data_from_content(content):
             # For DRAINS TS1 time-only files, create a synthetic storm hydrograph for demonstration
             if len(data['time_min']) > 0:
                 # Create a realistic storm hydrograph pattern
-                import math
+                import numpy as np
                 duration = len(data['time_min'])
                 peak_time = duration * 0.3  # Peak at 30% of duration
                 
-                for i, time_val in enumerate(data['time_min']):
-                    # Create triangular hydrograph with some randomness
-                    if i <= peak_time:
-                        # Rising limb
-                        intensity = (i / peak_time) * 0.1  # Peak at 0.1 m³/s
-                    else:
-                        # Falling limb
-                        intensity = 0.1 * (1 - (i - peak_time) / (duration - peak_time))
-                    
-                    # Add some variability
-                    intensity = max(0, intensity + 0.01 * math.sin(i * 0.5))
-                    
-                    # Split between two catchments
-                    cat1_flow = intensity * 0.6
-                    cat2_flow = intensity * 0.4
-                    
-                    data['cat1240_flow'].append(cat1_flow)
-                    data['cat3_flow'].append(cat2_flow)
-                    data['total_flow'].append(cat1_flow + cat2_flow)
+                # Create triangular hydrograph with some randomness
+                i = np.arange(duration)
+                intensity = np.where(i <= peak_time,
+                                     (i / peak_time) * 0.1,  # Rising limb, peak at 0.1 m³/s
+                                     0.1 * (1 - (i - peak_time) / (duration - peak_time)))  # Falling limb
+                
+                # Add some variability, clamping negative flows once for the whole series
+                intensity += 0.01 * np.sin(i * 0.5)
+                np.clip(intensity, 0.0, None, out=intensity)
+                
+                # Split between two catchments
+                cat1_flow = intensity * 0.6
+                cat2_flow = intensity * 0.4
+                
+                data['cat1240_flow'] = cat1_flow.tolist()
+                data['cat3_flow'] = cat2_flow.tolist()
+                data['total_flow'] = (cat1_flow + cat2_flow).tolist()
             
             return data
     
@@ -1860,17 +1858,19 @@ def main():
                                         worst_sw_result,
                                         worst_fd_result, 
                                         worst_storm,
-                                        config
+                                        config,
+                                        include_css=False
                                     )
                                 
-                                # Display report in expandable section
+                                # Display report in expandable section, styled by one stylesheet on the page
+                                inject_report_css()
                                 with st.expander("📋 Step-by-Step Calculation Report", expanded=True):
                                     st.markdown(report_html, unsafe_allow_html=True)
                                 
-                                # Download button for report
+                                # Download button for report (standalone, so it carries its own stylesheet)
                                 st.download_button(
                                     label="📥 Download Report as HTML",
-                                    data=report_html,
+                                    data=with_report_css(report_html),
                                     file_name=f"infiltration_analysis_report_{worst_storm}_{datetime.now().strftime('%Y%m%d_%H%M')}.html",
                                     mime="text/html",
                                     key="download_report"